@@ -6,7 +6,7 @@ from .state import AuditState, ExtractionResult, VerificationResult, ComplianceR
 from .extraction_agent import extraction_agent
 from .verification_agent import verification_agent
 from .compliance_agent import compliance_agent
-from .workflow import create_audit_workflow
+from .workflow import create_audit_workflow, run_workflow_batch, run_workflow_batch_sync
 
 __all__ = [
     "AuditState",
@@ -17,4 +17,6 @@ __all__ = [
     "verification_agent",
     "compliance_agent",
     "create_audit_workflow",
+    "run_workflow_batch",
+    "run_workflow_batch_sync",
 ]
@@ -0,0 +1,88 @@
+"""
+Extractive compression of the SEBI BRSR standards for LLM prompts.
+Keeps only headings and lines relevant to Principle 6 / Scope 3 evaluation,
+so the compliance prompt ships a dense excerpt instead of a blind character slice.
+"""
+
+import hashlib
+import logging
+import re
+from pathlib import Path
+
+import config
+
+logger = logging.getLogger(__name__)
+
+BRSR_STANDARDS_PATH = config.KNOWLEDGE_BASE_DIR / "sebi_brsr_standards.md"
+BRSR_COMPRESSED_PATH = config.KNOWLEDGE_BASE_DIR / "sebi_brsr_standards.compressed.md"
+
+# Lines mentioning any of these (or containing bold emphasis) are retained
+RELEVANT_KEYWORDS = (
+    "principle 6", "energy", "emission", "co2e", "scope 3", "disclosure",
+    "verification", "trust score", "deviation", "benchmark", "supplier",
+    "greenwashing", "risk", "methodology", "ghg", "data quality",
+    "transport mode", "completeness",
+)
+
+SOURCE_HASH_PREFIX = "<!-- source-sha256: "
+
+
+def _heading_level(line: str) -> int:
+    """Return the markdown heading level of a line (0 if not a heading)."""
+    return len(line) - len(line.lstrip("#"))
+
+
+def compress_standards(text: str) -> str:
+    """
+    Build an extractive summary of the BRSR standards markdown.
+
+    Args:
+        text: Full standards markdown
+
+    Returns:
+        Compressed markdown containing headings and keyword-matching lines only
+    """
+    kept = []
+    for raw_line in text.splitlines():
+        line = re.sub(r"\s+", " ", raw_line.replace("**", "")).strip()
+        if not line:
+            continue
+        if line.startswith("#"):
+            # Drop a previous heading that ended up with no content under it
+            while kept and _heading_level(kept[-1]) >= _heading_level(line) > 0:
+                kept.pop()
+            kept.append(line)
+        elif "**" in raw_line or any(keyword in line.lower() for keyword in RELEVANT_KEYWORDS):
+            kept.append(line)
+
+    while kept and kept[-1].startswith("#"):
+        kept.pop()
+
+    return "\n".join(kept)
+
+
+def load_compressed_standards() -> str:
+    """
+    Load the compressed standards, rebuilding the cached file if the source changed.
+
+    Returns:
+        Compressed standards text
+    """
+    source = BRSR_STANDARDS_PATH.read_text(encoding="utf-8")
+    source_hash = hashlib.sha256(source.encode("utf-8")).hexdigest()
+    header = f"{SOURCE_HASH_PREFIX}{source_hash} -->"
+
+    if BRSR_COMPRESSED_PATH.exists():
+        cached = BRSR_COMPRESSED_PATH.read_text(encoding="utf-8")
+        first_line, _, body = cached.partition("\n")
+        if first_line == header:
+            return body
+
+    compressed = compress_standards(source)
+    try:
+        BRSR_COMPRESSED_PATH.write_text(f"{header}\n{compressed}", encoding="utf-8")
+        logger.info("Compressed BRSR standards: %d -> %d chars", len(source), len(compressed))
+    except OSError as e:
+        logger.warning("Could not write compressed BRSR standards: %s", e)
+
+    return compressed
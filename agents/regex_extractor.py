@@ -1,19 +1,173 @@
 """
-Regex-based fallback extractor for when LLM fails.
+Regex-based extractor: a cheap first pass before the LLM, and the fallback when it fails.
 Ensures zero downtime during live demos.
 """
 
+import hashlib
 import re
-from typing import Optional, Dict, Any
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Set, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Patterns are compiled once at import and tried in order per field.
+# Fusing a field's patterns into one alternation was measured 1.4-4x slower:
+# CPython's backtracking engine loses its literal-prefix scan on alternations,
+# and preserving pattern priority needs rescans after a lower-priority hit.
+#
+# Each pattern is paired with a lowercase literal it cannot match without;
+# a substring check on the lowered text skips regex scans that would fail.
+#
+# Numeric fields are searched in the lowered text with lowercase patterns
+# (no re.IGNORECASE); supplier IDs and routes keep their original case, so
+# those patterns stay case-insensitive and run on the original text.
+# Numbers with or without thousands separators ("2,100.5", "2100.5")
+_NUMBER = r'(\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?)'
+
+# Emission intensities ("0.096 kg CO2e per ton-km", "kg/ton-km") are not totals
+_CO2E_PATTERNS = [(re.compile(p), literal) for p, literal in [
+    (_NUMBER + r'\s*kg\s*co2e(?!\s*(?:per\b|/))', "co2e"),
+    (r'co2e[:\s]+' + _NUMBER + r'\s*kg', "co2e"),
+    (r'emissions[:\s]+' + _NUMBER + r'\s*kg', "emissions"),
+    (r'carbon[:\s]+' + _NUMBER + r'\s*kg', "carbon")
+]]
+
+# The SUP- format has no capture group: the whole match is the ID
+_SUPPLIER_PATTERNS = [(re.compile(p, re.IGNORECASE), literal) for p, literal in [
+    (r'SUP-[A-Z]{2}-\d{4}-\d{3,4}', "sup-"),
+    (r'Supplier\s+ID[:\s]+([A-Z0-9-]+)', "supplier"),
+    (r'Vendor[:\s]+([A-Z0-9-]+)', "vendor")
+]]
+
+# Place names are letters, spaces and inner hyphens on a single line, so a match
+# can neither run across fields nor pick up "to" inside a word ("metric tons")
+_PLACE = r'([A-Za-z](?:[A-Za-z ]|-(?=[A-Za-z]))*)'
+_ROUTE_PATTERNS = [(re.compile(p, re.IGNORECASE | re.DOTALL), literal) for p, literal in [
+    (r'Origin[:\s]+' + _PLACE + r'.*?Destination[:\s]+' + _PLACE, "destination"),
+    (r'Route[:\s]+' + _PLACE + r'\s(?:→|->|to)\s+' + _PLACE, "route"),
+    (_PLACE + r'\s*(?:→|->)\s*' + _PLACE, ""),
+    (r'From[:\s]+' + _PLACE + r'.*?To[:\s]+' + _PLACE, "from")
+]]
+
+# Transport-mode keywords in priority order: when several modes are mentioned
+# the first one listed wins. Keywords are matched as whole words (a plural "s"
+# is allowed) so "shipment", "repair" or "training" do not read as sea, air or
+# rail; "cargo plane" is matched as a phrase.
+_MODE_KEYWORDS = (
+    ("road", ("truck", "road", "highway", "lorry", "vehicle")),
+    ("air", ("air", "flight", "aircraft")),
+    ("sea", ("sea", "ship", "vessel", "maritime", "ocean")),
+    ("rail", ("rail", "train", "railway")),
+)
+_MODE_PHRASES = (("cargo plane", "air"),)
+
+_MODE_BY_WORD = {
+    word: mode
+    for mode, keywords in _MODE_KEYWORDS
+    for keyword in keywords
+    for word in (keyword, keyword + "s")
+}
+_MODE_PRIORITY = {mode: rank for rank, (mode, _) in enumerate(_MODE_KEYWORDS)}
+_WORD_RE = re.compile(r"[a-z]+")
+
+# Weight and distance patterns capture (number, unit); labelled values come
+# first so a CO2e figure or a per-leg table entry is not read as the shipment
+# total. The trailing label-only patterns capture an empty unit.
+_WEIGHT_UNIT = r'(kg|kilograms?|(?:metric\s*)?tons?|tonnes?)\b(?!-)'
+_WEIGHT_PATTERNS = [(re.compile(p), literal) for p, literal in [
+    (r'weight[:\s]+' + _NUMBER + r'\s*' + _WEIGHT_UNIT, "weight"),
+    (_NUMBER + r'\s*(kg)\b(?!\s*(?:co2|/))', "kg"),
+    (_NUMBER + r'\s*(kilograms?)\b', "kilogram"),
+    (_NUMBER + r'\s*((?:metric\s*)?tons?|tonnes?)\b(?!-)', "ton"),
+    (r'weight[:\s]+' + _NUMBER + r'()', "weight")
+]]
+
+_DISTANCE_UNIT = r'(km|kilomet(?:er|re)s?|nautical\s*miles?|miles?)\b'
+_DISTANCE_PATTERNS = [(re.compile(p), literal) for p, literal in [
+    (r'distance[:\s]+' + _NUMBER + r'\s*' + _DISTANCE_UNIT, "distance"),
+    (_NUMBER + r'\s*(km|kilomet(?:er|re)s?)\b', "k"),
+    (_NUMBER + r'\s*(nautical\s*miles?)\b', "nautical"),
+    (_NUMBER + r'\s*(miles?)\b', "mile"),
+    (r'distance[:\s]+' + _NUMBER + r'()', "distance")
+]]
+
+# Conversion factors to kg / km, keyed on the leading letters of the matched unit
+_WEIGHT_FACTORS = (("kg", 1.0), ("kilogram", 1.0), ("metric", 1000.0), ("ton", 1000.0))
+_DISTANCE_FACTORS = (("km", 1.0), ("kilomet", 1.0), ("nautical", 1.852), ("mile", 1.60934))
+
+# Route ends longer than this many words are taken to be misparsed text
+_MAX_PLACE_WORDS = 4
+
+
+# Memoized extraction results, keyed on a SHA-256 digest of the invoice text
+# (never the text itself) and evicted least-recently-used first
+_RESULT_CACHE_SIZE = 1024
+_result_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_result_cache_lock = threading.Lock()
+
+# Minimum fields for a usable extraction (verification inputs + claim)
+_REQUIRED_FIELDS = ("co2e_claimed", "transport_mode", "weight_kg", "distance_km")
+
+# Fields that must all be present to skip the LLM on a regex extraction
+_SHORT_CIRCUIT_FIELDS = ("co2e_claimed", "supplier_id", "route", "transport_mode", "weight_kg", "distance_km")
+
+
+def _first_match(
+    patterns: List[Tuple[re.Pattern, str]],
+    text: str,
+    text_lower: str
+) -> Optional[re.Match]:
+    """Return the first match in priority order, skipping patterns whose literal is absent."""
+    for pattern, literal in patterns:
+        if literal in text_lower:
+            match = pattern.search(text)
+            if match:
+                return match
+    return None
+
+
+def _detect_transport_modes(text_lower: str) -> Set[str]:
+    """Return every transport mode mentioned in the lowered text."""
+    modes = {_MODE_BY_WORD[word] for word in _WORD_RE.findall(text_lower) if word in _MODE_BY_WORD}
+    for phrase, mode in _MODE_PHRASES:
+        if phrase in text_lower:
+            modes.add(mode)
+    return modes
+
+
+def _parse_quantity(match: re.Match, factors: Tuple[Tuple[str, float], ...]) -> Tuple[float, bool]:
+    """
+    Convert a (number, unit) match to the base unit.
+    
+    Returns:
+        Tuple of (value, unit_stated); an unstated unit is taken as the base unit
+    """
+    value = float(match.group(1).replace(',', ''))
+    unit = match.group(2)
+    for prefix, factor in factors:
+        if unit.startswith(prefix):
+            return value * factor, True
+    return value, False
+
+
+def _route_is_plausible(origin: str, destination: str) -> bool:
+    """Check that both route ends look like place names rather than misparsed text."""
+    return all(
+        len(place) >= 2 and len(place.split()) <= _MAX_PLACE_WORDS
+        for place in (origin, destination)
+    ) and origin.lower() != destination.lower()
+
 
 def extract_with_regex(text: str) -> Dict[str, Any]:
     """
     Extract carbon metrics using regex patterns.
-    Fallback when OpenAI API fails.
+    Runs before the LLM, and is the fallback when the LLM fails.
+    
+    Results are memoized on a SHA-256 digest of the invoice text, so reruns
+    and retries of the same document skip the scan without the cache holding
+    raw invoice text; each call gets its own copy of the dict.
     
     Args:
         text: Raw invoice text
@@ -21,8 +175,33 @@ def extract_with_regex(text: str) -> Dict[str, Any]:
     Returns:
         Dictionary with extracted fields
     """
-    logger.info("Using regex fallback extractor")
+    logger.info("Running regex extractor")
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    
+    with _result_cache_lock:
+        result = _result_cache.get(digest)
+        if result is not None:
+            _result_cache.move_to_end(digest)
+            return dict(result)
+    
+    result = _run_regex_extraction(text)
+    
+    with _result_cache_lock:
+        _result_cache[digest] = result
+        if len(_result_cache) > _RESULT_CACHE_SIZE:
+            _result_cache.popitem(last=False)
     
+    return dict(result)
+
+
+def _run_regex_extraction(text: str) -> Dict[str, Any]:
+    """
+    Run the regex extraction (uncached).
+    
+    Besides the fields, the result carries ``validation_issues``: a tuple of
+    reasons the fields should not be trusted without the LLM (ambiguous or
+    unitless values, a misparsed route, conflicting transport modes).
+    """
     result = {
         "co2e_claimed": None,
         "supplier_id": None,
@@ -32,112 +211,83 @@ def extract_with_regex(text: str) -> Dict[str, Any]:
         "distance_km": None,
         "extraction_confidence": 0.6  # Lower confidence for regex
     }
+    issues = []
+    
+    text_lower = text.lower()
     
     # Extract CO2e emissions
-    co2e_patterns = [
-        r'(\d+\.?\d*)\s*kg\s*CO2e',
-        r'CO2e[:\s]+(\d+\.?\d*)\s*kg',
-        r'emissions[:\s]+(\d+\.?\d*)\s*kg',
-        r'carbon[:\s]+(\d+\.?\d*)\s*kg'
-    ]
-    
-    for pattern in co2e_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            result["co2e_claimed"] = float(match.group(1))
-            break
+    match = _first_match(_CO2E_PATTERNS, text_lower, text_lower)
+    if match:
+        result["co2e_claimed"] = float(match.group(1).replace(',', ''))
+        totals = {total.replace(',', '') for total in _CO2E_PATTERNS[0][0].findall(text_lower)}
+        if len(totals) > 1:
+            issues.append(f"several different CO2e figures ({', '.join(sorted(totals))} kg)")
     
     # Extract supplier ID
-    supplier_patterns = [
-        r'SUP-[A-Z]{2}-\d{4}-\d{3,4}',
-        r'Supplier\s+ID[:\s]+([A-Z0-9-]+)',
-        r'Vendor[:\s]+([A-Z0-9-]+)'
-    ]
-    
-    for pattern in supplier_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            result["supplier_id"] = match.group(0) if 'SUP-' in pattern else match.group(1)
-            break
+    match = _first_match(_SUPPLIER_PATTERNS, text, text_lower)
+    if match:
+        result["supplier_id"] = match.group(1 if match.re.groups else 0)
     
     # Extract route
-    route_patterns = [
-        r'([A-Za-z\s]+)\s*(?:→|->|to)\s*([A-Za-z\s]+)',
-        r'Origin[:\s]+([A-Za-z\s]+).*?Destination[:\s]+([A-Za-z\s]+)',
-        r'From[:\s]+([A-Za-z\s]+).*?To[:\s]+([A-Za-z\s]+)'
-    ]
-    
-    for pattern in route_patterns:
-        match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
-        if match:
-            origin = match.group(1).strip()
-            destination = match.group(2).strip()
+    match = _first_match(_ROUTE_PATTERNS, text, text_lower)
+    if match:
+        origin = match.group(1).strip()
+        destination = match.group(2).strip()
+        if _route_is_plausible(origin, destination):
             result["route"] = f"{origin}-{destination}"
-            break
+        else:
+            issues.append("route text does not look like two place names")
     
     # Extract transport mode
-    mode_keywords = {
-        "road": ["truck", "road", "highway", "lorry", "vehicle"],
-        "air": ["air", "flight", "aircraft", "cargo plane"],
-        "sea": ["sea", "ship", "vessel", "maritime", "ocean"],
-        "rail": ["rail", "train", "railway"]
-    }
+    modes = _detect_transport_modes(text_lower)
+    if modes:
+        result["transport_mode"] = min(modes, key=_MODE_PRIORITY.__getitem__)
+    if len(modes) > 1:
+        issues.append(f"several transport modes mentioned ({', '.join(sorted(modes))})")
     
-    text_lower = text.lower()
-    for mode, keywords in mode_keywords.items():
-        if any(keyword in text_lower for keyword in keywords):
-            result["transport_mode"] = mode
-            break
-    
-    # Extract weight
-    weight_patterns = [
-        r'(\d+,?\d*\.?\d*)\s*kg',
-        r'(\d+,?\d*\.?\d*)\s*kilograms',
-        r'weight[:\s]+(\d+,?\d*\.?\d*)',
-        r'(\d+\.?\d*)\s*(?:metric\s*)?tons?'
-    ]
-    
-    for pattern in weight_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            weight_str = match.group(1).replace(',', '')
-            weight = float(weight_str)
-            
-            # Convert tons to kg if needed
-            if 'ton' in match.group(0).lower():
-                weight *= 1000
-            
-            result["weight_kg"] = weight
-            break
-    
-    # Extract distance
-    distance_patterns = [
-        r'(\d+,?\d*\.?\d*)\s*km',
-        r'(\d+,?\d*\.?\d*)\s*kilometers',
-        r'distance[:\s]+(\d+,?\d*\.?\d*)',
-        r'(\d+,?\d*\.?\d*)\s*miles?'
-    ]
-    
-    for pattern in distance_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            distance_str = match.group(1).replace(',', '')
-            distance = float(distance_str)
-            
-            # Convert miles to km if needed
-            if 'mile' in match.group(0).lower():
-                distance *= 1.60934
-            
-            result["distance_km"] = distance
-            break
+    # Extract weight (converted to kg)
+    match = _first_match(_WEIGHT_PATTERNS, text_lower, text_lower)
+    if match:
+        result["weight_kg"], unit_stated = _parse_quantity(match, _WEIGHT_FACTORS)
+        if not unit_stated:
+            issues.append("weight unit not stated")
+    
+    # Extract distance (converted to km)
+    match = _first_match(_DISTANCE_PATTERNS, text_lower, text_lower)
+    if match:
+        result["distance_km"], unit_stated = _parse_quantity(match, _DISTANCE_FACTORS)
+        if not unit_stated:
+            issues.append("distance unit not stated")
+    
+    if result["co2e_claimed"] is not None and result["co2e_claimed"] == result["weight_kg"]:
+        issues.append("weight matches the CO2e figure")
+    
+    result["validation_issues"] = tuple(issues)
     
     # Log extraction results
-    extracted_fields = [k for k, v in result.items() if v is not None and k != "extraction_confidence"]
-    logger.info(f"Regex extraction complete. Extracted fields: {extracted_fields}")
+    extracted_fields = [k for k, v in result.items() if v is not None and k in _SHORT_CIRCUIT_FIELDS]
+    logger.info("Regex extraction complete. Extracted fields: %s", extracted_fields)
+    if issues:
+        logger.info("Regex extraction validation issues: %s", issues)
     
     return result
 
 
+def is_validated(result: Dict[str, Any]) -> bool:
+    """
+    Check whether a regex extraction can be trusted without the LLM.
+    
+    Args:
+        result: Extraction result dictionary
+        
+    Returns:
+        True if every field is present and no validation check failed
+    """
+    if result.get("validation_issues"):
+        return False
+    return all(result.get(field) is not None for field in _SHORT_CIRCUIT_FIELDS)
+
+
 def validate_extraction(result: Dict[str, Any]) -> bool:
     """
     Validate that minimum required fields were extracted.
@@ -148,12 +298,10 @@ def validate_extraction(result: Dict[str, Any]) -> bool:
     Returns:
         True if valid, False otherwise
     """
-    required_fields = ["co2e_claimed", "transport_mode", "weight_kg", "distance_km"]
-    
-    for field in required_fields:
-        if result.get(field) is None:
-            logger.warning(f"Missing required field: {field}")
-            return False
+    missing = [field for field in _REQUIRED_FIELDS if result.get(field) is None]
+    if missing:
+        logger.warning("Missing required fields: %s", missing)
+        return False
     
     return True
 
@@ -4,8 +4,10 @@ Defines the data structures passed between agents in the LangGraph workflow.
 """
 
 from typing import Optional, List, Dict, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, SerializationInfo, model_serializer, model_validator
+from pydantic.json_schema import SkipJsonSchema
 from datetime import datetime
+import zlib
 
 
 class ReasoningStep(BaseModel):
@@ -16,6 +18,16 @@ class ReasoningStep(BaseModel):
     action: str = Field(description="Action taken by the agent")
     reasoning: str = Field(description="Reasoning behind the action")
     result: Optional[str] = Field(None, description="Result of the action")
+    data: Optional[Dict[str, Any]] = Field(
+        None, description="Raw values behind the reasoning, formatted only when displayed"
+    )
+    
+    def render_reasoning(self) -> str:
+        """Return the reasoning text with any structured data appended."""
+        if not self.data:
+            return self.reasoning
+        details = ", ".join(f"{key}={value}" for key, value in self.data.items())
+        return f"{self.reasoning} with {details}"
 
 
 class ExtractionResult(BaseModel):
@@ -45,9 +57,10 @@ class ExtractionResult(BaseModel):
         None, 
         description="Distance traveled in kilometers"
     )
-    extracted_text: str = Field(
-        default="", 
-        description="Raw text extracted from PDF"
+    extracted_text_blob: SkipJsonSchema[Optional[bytes]] = Field(
+        default=None,
+        exclude=True,
+        description="zlib-compressed raw text extracted from PDF (read via extracted_text)"
     )
     extraction_confidence: float = Field(
         default=0.0, 
@@ -59,6 +72,37 @@ class ExtractionResult(BaseModel):
         default_factory=list,
         description="List of extraction errors or warnings"
     )
+    
+    @model_validator(mode="before")
+    @classmethod
+    def _compress_extracted_text(cls, data: Any) -> Any:
+        """Accept extracted_text as a plain string and store it compressed."""
+        if isinstance(data, dict) and "extracted_text" in data:
+            data = dict(data)
+            text = data.pop("extracted_text")
+            data["extracted_text_blob"] = zlib.compress(text.encode("utf-8"), 3) if text else None
+        return data
+    
+    @model_serializer(mode="wrap")
+    def _serialize_extracted_text(self, handler: Any, info: SerializationInfo) -> Dict[str, Any]:
+        """Dump the text as plain extracted_text, so dumps are JSON-safe and round-trip."""
+        data = handler(self)
+        if (info.include is None or "extracted_text" in info.include) and (
+            info.exclude is None or "extracted_text" not in info.exclude
+        ):
+            data["extracted_text"] = self.extracted_text
+        return data
+    
+    @property
+    def extracted_text(self) -> str:
+        """Raw text extracted from PDF, decompressed on access."""
+        if not self.extracted_text_blob:
+            return ""
+        return zlib.decompress(self.extracted_text_blob).decode("utf-8")
+    
+    @extracted_text.setter
+    def extracted_text(self, text: str) -> None:
+        self.extracted_text_blob = zlib.compress(text.encode("utf-8"), 3) if text else None
 
 
 class VerificationResult(BaseModel):
@@ -113,6 +157,10 @@ class ComplianceResult(BaseModel):
         default_factory=dict,
         description="Detailed compliance assessment"
     )
+    cache_stats: Dict[str, int] = Field(
+        default_factory=dict,
+        description="Prompt-cache token usage reported by the LLM provider"
+    )
 
 
 class AuditState(BaseModel):
@@ -171,3 +219,102 @@ class AuditState(BaseModel):
     
     class Config:
         arbitrary_types_allowed = True
+    
+    def log_step(
+        self,
+        agent: str,
+        action: str,
+        reasoning: str,
+        result: Optional[str] = None,
+        timestamp: Optional[datetime] = None,
+        data: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Append a reasoning step to the history.
+        
+        Built with model_construct to skip field validation: every value
+        comes from agent code, and this runs 5-8 times per agent per document.
+        Agents may pass one timestamp captured at entry for all their steps,
+        and raw values as data instead of formatting them into reasoning.
+        """
+        self.reasoning_history.append(ReasoningStep.model_construct(
+            agent=agent,
+            timestamp=timestamp or datetime.now(),
+            action=action,
+            reasoning=reasoning,
+            result=result,
+            data=data
+        ))
+    
+    def to_output_dict(self) -> Dict[str, Any]:
+        """
+        Build the JSON-ready audit report written by the CLI and demo runner.
+        
+        Returns:
+            Audit results as dictionary
+        """
+        output = {
+            "document_id": self.document_id,
+            "audit_date": self.audit_date.isoformat(),
+            "workflow_status": self.workflow_status,
+            "extraction": None,
+            "verification": None,
+            "compliance": None,
+            "errors": self.errors
+        }
+        
+        # Add extraction results
+        if self.extraction:
+            output["extraction"] = {
+                "co2e_claimed": self.extraction.co2e_claimed,
+                "supplier_id": self.extraction.supplier_id,
+                "route": self.extraction.route,
+                "transport_mode": self.extraction.transport_mode,
+                "weight_kg": self.extraction.weight_kg,
+                "distance_km": self.extraction.distance_km,
+                "extraction_confidence": self.extraction.extraction_confidence,
+                "errors": self.extraction.errors
+            }
+        
+        # Add verification results
+        if self.verification:
+            output["verification"] = {
+                "benchmark_co2e": self.verification.benchmark_co2e,
+                "deviation_percent": self.verification.deviation_percent,
+                "status": self.verification.status,
+                "discrepancies": self.verification.discrepancies,
+                "verification_confidence": self.verification.verification_confidence
+            }
+        
+        # Add compliance results
+        if self.compliance:
+            output["compliance"] = {
+                "trust_score": self.compliance.trust_score,
+                "brsr_aligned": self.compliance.brsr_aligned,
+                "category": self.compliance.category,
+                "recommendations": self.compliance.recommendations,
+                "compliance_details": self.compliance.compliance_details,
+                "cache_stats": self.compliance.cache_stats
+            }
+        
+        # Add reasoning history
+        output["reasoning_history"] = [
+            {
+                "agent": step.agent,
+                "timestamp": step.timestamp.isoformat(),
+                "action": step.action,
+                "reasoning": step.render_reasoning(),
+                "result": step.result
+            }
+            for step in self.reasoning_history
+        ]
+        
+        # Add human review status
+        output["human_review"] = {
+            "required": self.requires_human_review,
+            "reason": self.human_review_reason,
+            "completed": self.human_review_completed,
+            "decision": self.human_review_decision
+        }
+        
+        return output
@@ -3,11 +3,20 @@ LangGraph workflow orchestration for multi-agent ESG audit.
 Defines the agent execution graph and state transitions with human review logic.
 """
 
+import asyncio
+import sqlite3
+import uuid
+from datetime import datetime
+from functools import cache
+from typing import List
 from langgraph.graph import StateGraph, END
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.sqlite import SqliteSaver
 from .state import AuditState
 from .extraction_agent import extraction_agent
 from .verification_agent import verification_agent
 from .compliance_agent import compliance_agent
+import config
 import logging
 
 logger = logging.getLogger(__name__)
@@ -31,7 +40,7 @@ def should_continue_after_verification(state: AuditState) -> str:
 def should_require_human_review(state: AuditState) -> str:
     """Conditional edge: decide if human review is needed after compliance."""
     if state.requires_human_review and not state.human_review_completed:
-        logger.info(f"Flagging for human review: {state.human_review_reason}")
+        logger.info("Flagging for human review: %s", state.human_review_reason)
         return "human_review"
     return "end"
 
@@ -41,19 +50,16 @@ def human_review_node(state: AuditState) -> AuditState:
     Human Review node - simulates human reviewer decision.
     In production, this would pause the workflow and wait for human input.
     """
-    logger.info(f"Human review required: {state.human_review_reason}")
+    logger.info("Human review required: %s", state.human_review_reason)
+    now = datetime.now()
     
-    # Log reasoning
-    from .state import ReasoningStep
-    from datetime import datetime
-    
-    state.reasoning_history.append(ReasoningStep(
+    state.log_step(
         agent="human_review",
-        timestamp=datetime.now(),
+        timestamp=now,
         action="review_flagged",
         reasoning=f"Invoice flagged for human review: {state.human_review_reason}",
         result="PENDING_REVIEW"
-    ))
+    )
     
     # In production with HITL:
     # 1. Workflow pauses before this node (interrupt_before)
@@ -69,19 +75,37 @@ def human_review_node(state: AuditState) -> AuditState:
     state.human_review_completed = True
     state.workflow_status = f"human_review_{decision.lower()}"
     
-    state.reasoning_history.append(ReasoningStep(
+    state.log_step(
         agent="human_review",
-        timestamp=datetime.now(),
+        timestamp=now,
         action="review_decision",
         reasoning=f"Human reviewer decision: {decision.upper()}",
         result=decision.upper()
-    ))
+    )
     
-    logger.info(f"Human review decision processed: {decision}")
+    logger.info("Human review decision processed: %s", decision)
     return state
 
 
-def create_audit_workflow():
+@cache
+def _get_sqlite_checkpointer() -> SqliteSaver:
+    """
+    Shared SQLite checkpointer, opened once per process.
+    
+    WAL journaling with synchronous=NORMAL avoids an fsync on every
+    checkpoint write, which LangGraph performs after each node.
+    """
+    conn = sqlite3.connect(config.CHECKPOINT_DB_PATH, check_same_thread=False)
+    conn.executescript(
+        "PRAGMA journal_mode=WAL;"
+        "PRAGMA synchronous=NORMAL;"
+        "PRAGMA temp_store=MEMORY;"
+        "PRAGMA cache_size=-65536;"
+    )
+    return SqliteSaver(conn)
+
+
+def create_audit_workflow(persist: bool = True):
     """
     Create the LangGraph workflow for ESG audit with human review.
     
@@ -91,6 +115,11 @@ def create_audit_workflow():
     3. Compliance Agent → evaluates BRSR compliance
     4. Human Review (conditional) → if flagged for review
     
+    Args:
+        persist: Checkpoint to SQLite so interrupted audits can be resumed
+            from a new workflow instance (e.g. across Streamlit reruns).
+            If False, checkpoints are kept in memory only.
+    
     Returns:
         Compiled LangGraph workflow
     """
@@ -138,15 +167,8 @@ def create_audit_workflow():
     # Edge from human review to end
     workflow.add_edge("human_review", END)
     
-    # Initialize checkpointer (SQLite)
-    import sqlite3
-    from langgraph.checkpoint.sqlite import SqliteSaver
-    
-    # Use distinct connection per thread? No, Checkpointer handles it.
-    # Note: connect outside or ensure reuse. For simplicity in Streamlit, we create new connection
-    # or rely on SqliteSaver opening it.
-    conn = sqlite3.connect("checkpoints.db", check_same_thread=False)
-    checkpointer = SqliteSaver(conn)
+    # Initialize checkpointer (SQLite connection is shared across workflow instances)
+    checkpointer = _get_sqlite_checkpointer() if persist else MemorySaver()
     
     # Compile the graph with persistence and interrupt
     # interrupt_before=["human_review"]: Pause before entering human review node
@@ -155,6 +177,46 @@ def create_audit_workflow():
         interrupt_before=["human_review"]
     )
     
-    logger.info("Audit workflow created with persistence (SQLite) and HITL interrupts")
+    logger.info("Audit workflow created with persistence (%s) and HITL interrupts", "SQLite" if persist else "memory")
     return app
 
+
+async def run_workflow_batch(states: List[AuditState], max_concurrency: int = 8) -> List[AuditState]:
+    """
+    Run the audit workflow over independent documents concurrently.
+    
+    Each state gets its own checkpoint thread. LangGraph's ``ainvoke`` runs the
+    synchronous agent nodes in worker threads, so PDF parsing and LLM calls for
+    different documents overlap; a semaphore caps in-flight audits to stay
+    within provider rate limits. Batch threads are never resumed, so they are
+    checkpointed in memory (SqliteSaver has no async interface).
+    
+    Args:
+        states: Initialized audit states (one per document)
+        max_concurrency: Maximum number of audits in flight at once
+        
+    Returns:
+        Final audit states, in the same order as the input
+    """
+    app = create_audit_workflow(persist=False)
+    semaphore = asyncio.Semaphore(max_concurrency)
+    
+    async def run_one(state: AuditState) -> AuditState:
+        async with semaphore:
+            run_config = {"configurable": {"thread_id": str(uuid.uuid4())}}
+            try:
+                result = await app.ainvoke(state, config=run_config)
+            except Exception as e:
+                # One failed document must not abort the rest of the batch
+                logger.error("Workflow failed for %s: %s", state.document_id, e)
+                state.workflow_status = "workflow_failed"
+                state.errors.append(f"Workflow error: {str(e)}")
+                return state
+            return AuditState.model_construct(**result) if isinstance(result, dict) else result
+    
+    return await asyncio.gather(*(run_one(state) for state in states))
+
+
+def run_workflow_batch_sync(states: List[AuditState], max_concurrency: int = 8) -> List[AuditState]:
+    """Synchronous wrapper around run_workflow_batch for CLI entry points."""
+    return asyncio.run(run_workflow_batch(states, max_concurrency=max_concurrency))
@@ -5,20 +5,24 @@ Tries live API first, falls back to demo mode if quota exceeded.
 
 import uuid
 import streamlit as st
-import plotly.graph_objects as go
 from pathlib import Path
-import json
+import orjson
 import sys
-from datetime import datetime
+from typing import List, Optional
 import os
+import tempfile
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from agents import create_audit_workflow, AuditState
-from agents.state import ExtractionResult, VerificationResult, ComplianceResult, ReasoningStep
-from knowledge_base.logistics_api import logistics_api
-from llm_providers import get_available_providers, PROVIDER_CONFIGS
+# The agents package (LangGraph, PyMuPDF, agent modules) is imported inside the
+# functions that run or resume audits, so the page renders before it loads
+from llm_providers import get_available_providers, get_selected_provider, PROVIDER_CONFIGS
+
+try:
+    import demo_config
+except ImportError:
+    demo_config = None
 
 # Page configuration
 st.set_page_config(
@@ -44,30 +48,53 @@ st.markdown("""
         text-align: center;
         margin-bottom: 2rem;
     }
-    .success-box {
-        background-color: #E8F5E9;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        border-left: 4px solid #2E7D32;
-    }
     .warning-box {
         background-color: #FFF3E0;
         padding: 1rem;
         border-radius: 0.5rem;
         border-left: 4px solid #F57C00;
     }
-    .error-box {
-        background-color: #FFEBEE;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        border-left: 4px solid #C62828;
-    }
 </style>
 """, unsafe_allow_html=True)
 
 
-def create_trust_score_gauge(score: float, brsr_aligned: bool):
-    """Create a Plotly gauge chart for Trust Score."""
+# Static parts of the trust score gauge; only the value, bar colour and
+# BRSR badge vary per audit (Plotly copies these when building the figure)
+GAUGE_BASE = {
+    'axis': {'range': [None, 100], 'tickwidth': 1, 'tickcolor': "darkblue"},
+    'bgcolor': "white",
+    'borderwidth': 2,
+    'bordercolor': "gray",
+    'steps': [
+        {'range': [0, 60], 'color': '#FFEBEE'},
+        {'range': [60, 80], 'color': '#FFF3E0'},
+        {'range': [80, 100], 'color': '#E8F5E9'}
+    ],
+    'threshold': {
+        'line': {'color': "red", 'width': 4},
+        'thickness': 0.75,
+        'value': 60
+    }
+}
+
+GAUGE_LAYOUT = {
+    'height': 340,
+    'margin': {'l': 20, 'r': 20, 't': 50, 'b': 60},
+    'paper_bgcolor': "white",
+    'font': {'color': "darkblue", 'family': "Arial"}
+}
+
+
+@st.cache_data(ttl=60 * 60, max_entries=128, show_spinner=False)
+def create_trust_score_gauge(score: float, brsr_aligned: bool) -> dict:
+    """
+    Create a Plotly gauge chart for Trust Score.
+    
+    Returned as a figure dict so st.cache_data can reuse it across reruns;
+    st.plotly_chart accepts the dict directly.
+    """
+    # Imported here so plotly only loads once there is a result to chart
+    import plotly.graph_objects as go
     
     if score >= 80:
         color = "#2E7D32"
@@ -82,33 +109,115 @@ def create_trust_score_gauge(score: float, brsr_aligned: bool):
         domain={'x': [0, 1], 'y': [0, 1]},
         title={'text': "Trust Score", 'font': {'size': 24}},
         delta={'reference': 60, 'increasing': {'color': "#2E7D32"}},
-        gauge={
-            'axis': {'range': [None, 100], 'tickwidth': 1, 'tickcolor': "darkblue"},
-            'bar': {'color': color},
-            'bgcolor': "white",
-            'borderwidth': 2,
-            'bordercolor': "gray",
-            'steps': [
-                {'range': [0, 60], 'color': '#FFEBEE'},
-                {'range': [60, 80], 'color': '#FFF3E0'},
-                {'range': [80, 100], 'color': '#E8F5E9'}
-            ],
-            'threshold': {
-                'line': {'color': "red", 'width': 4},
-                'thickness': 0.75,
-                'value': 60
-            }
-        }
+        gauge={**GAUGE_BASE, 'bar': {'color': color}}
     ))
     
-    fig.update_layout(
-        height=300,
-        margin=dict(l=20, r=20, t=50, b=20),
-        paper_bgcolor="white",
-        font={'color': "darkblue", 'family': "Arial"}
+    # BRSR alignment badge drawn under the gauge, in the same chart element
+    fig.add_annotation(
+        text="✅ <b>SEBI BRSR Aligned</b>" if brsr_aligned else "❌ <b>Not SEBI BRSR Aligned</b>",
+        x=0.5, y=-0.12, xref="paper", yref="paper",
+        showarrow=False,
+        font={'size': 16, 'color': "#2E7D32" if brsr_aligned else "#C62828"},
+        bgcolor="#E8F5E9" if brsr_aligned else "#FFEBEE",
+        borderpad=8
     )
     
-    return fig
+    fig.update_layout(**GAUGE_LAYOUT)
+    
+    return fig.to_dict()
+
+
+AGENT_EMOJI = {
+    "extraction": "📄",
+    "verification": "🔍",
+    "compliance": "✅",
+    "human_review": "👤"
+}
+
+RESULT_COLOR = {
+    "SUCCESS": "🟢",
+    "ACCEPTABLE": "🟢",
+    "FLAGGED": "🟡",
+    "PENDING_REVIEW": "🟡",
+    "APPROVE": "🟢",
+    "REJECT": "🔴",
+    "ERROR": "🔴",
+    "FAILED": "🔴",
+    "FALLBACK_ACTIVATED": "🟡"
+}
+
+# Reasoning steps rendered as individual expanders before the rest are batched
+EXPANDED_STEPS = 3
+
+SAMPLE_FILES = (
+    "valid_invoice.pdf",
+    "suspicious_invoice.pdf",
+    "edge_case_missing_date.pdf",
+    "edge_case_eur_currency.pdf",
+    "edge_case_high_risk_region.pdf",
+    "edge_case_multimodal.pdf",
+    "edge_case_zero_emissions.pdf"
+)
+
+ABOUT_TEMPLATE = """
+        **GreenTrust AI** uses multi-agent AI to audit carbon emission claims.
+        
+        **Agents:**
+        - 📄 Extraction Agent (with regex fallback)
+        - 🔍 Verification Agent
+        - ✅ Compliance Agent
+        - 👤 Human Review
+        
+        **Fallback**: {fallback}
+        """
+
+
+def _step_title(i: int, step) -> str:
+    """Header line for a reasoning step."""
+    agent_emoji = AGENT_EMOJI.get(step.agent, "🤖")
+    result_color = RESULT_COLOR.get(step.result, "⚪")
+    return f"{agent_emoji} **Step {i}: [{step.agent.upper()}]** {step.action} {result_color}"
+
+
+def export_audit_json(state) -> bytes:
+    """
+    Serialize an audit result for download.
+    
+    The download button needs its data on every rerun of the results page,
+    so the JSON is built once per audit result and kept in session state.
+    """
+    cached = st.session_state.get('_export_cache')
+    if cached and cached[0] is state:
+        return cached[1]
+    
+    export_data = {
+        "document_id": state.document_id,
+        "audit_date": state.audit_date.isoformat(),
+        "workflow_status": state.workflow_status,
+        "extraction": state.extraction.model_dump() if state.extraction else None,
+        "verification": state.verification.model_dump() if state.verification else None,
+        "compliance": state.compliance.model_dump() if state.compliance else None,
+        "reasoning_history": [
+            {
+                "agent": step.agent,
+                "timestamp": step.timestamp.isoformat(),
+                "action": step.action,
+                "reasoning": step.render_reasoning(),
+                "result": step.result
+            }
+            for step in state.reasoning_history
+        ],
+        "human_review": {
+            "required": state.requires_human_review,
+            "reason": state.human_review_reason,
+            "completed": state.human_review_completed,
+            "decision": state.human_review_decision
+        }
+    }
+    
+    export_json = orjson.dumps(export_data, option=orjson.OPT_INDENT_2)
+    st.session_state['_export_cache'] = (state, export_json)
+    return export_json
 
 
 def display_thinking_process(reasoning_history):
@@ -116,63 +225,143 @@ def display_thinking_process(reasoning_history):
     
     st.markdown("### 🧠 Agent Thinking Process")
     
-    for i, step in enumerate(reasoning_history, 1):
-        agent_emoji = {
-            "extraction": "📄",
-            "verification": "🔍",
-            "compliance": "✅",
-            "human_review": "👤"
-        }.get(step.agent, "🤖")
-        
-        result_color = {
-            "SUCCESS": "🟢",
-            "ACCEPTABLE": "🟢",
-            "FLAGGED": "🟡",
-            "PENDING_REVIEW": "🟡",
-            "APPROVE": "🟢",
-            "REJECT": "🔴",
-            "ERROR": "🔴",
-            "FAILED": "🔴",
-            "FALLBACK_ACTIVATED": "🟡"
-        }.get(step.result, "⚪")
-        
-        with st.expander(f"{agent_emoji} **Step {i}: [{step.agent.upper()}]** {step.action} {result_color}", expanded=(i <= 3)):
-            st.markdown(f"**Reasoning:** {step.reasoning}")
+    # The first steps get their own open expanders; the rest are joined into
+    # one markdown block so long histories send a single element, not N
+    head = reasoning_history[:EXPANDED_STEPS]
+    tail = reasoning_history[EXPANDED_STEPS:]
+    
+    for i, step in enumerate(head, 1):
+        with st.expander(_step_title(i, step), expanded=True):
+            st.markdown(f"**Reasoning:** {step.render_reasoning()}")
             if step.result:
                 st.markdown(f"**Result:** `{step.result}`")
             st.caption(f"Timestamp: {step.timestamp.strftime('%H:%M:%S')}")
+    
+    if tail:
+        blocks = []
+        for i, step in enumerate(tail, EXPANDED_STEPS + 1):
+            block = f"{_step_title(i, step)}\n\n**Reasoning:** {step.render_reasoning()}"
+            if step.result:
+                block += f"\n\n**Result:** `{step.result}`"
+            blocks.append(f"{block}\n\n*Timestamp: {step.timestamp.strftime('%H:%M:%S')}*")
+        
+        with st.expander(f"More steps ({len(tail)})", expanded=False):
+            st.markdown("\n\n---\n\n".join(blocks))
+
+
+@st.cache_resource(show_spinner=False)
+def get_workflow():
+    """Compile the audit workflow once per Streamlit process and share it across sessions."""
+    from agents import create_audit_workflow
+    return create_audit_workflow()
 
 
-def run_live_audit(pdf_path: str, thread_id: str = None):
-    """Run audit with live API and persistence."""
+class _AuditPaused(Exception):
+    """Raised out of the cached audit so runs paused for human review are never cached."""
+    
+    def __init__(self, final_state):
+        super().__init__("Audit paused for human review")
+        self.final_state = final_state
+
+
+def _execute_audit(pdf_path: str, document_id: str, thread_id: str):
+    """Run the workflow on one PDF; return (final_state, paused)."""
+    from agents import AuditState
     
-    if not thread_id:
-        thread_id = str(uuid.uuid4())
-        
-    document_id = Path(pdf_path).stem
     initial_state = AuditState(
         pdf_path=pdf_path,
         document_id=document_id
     )
     
-    workflow = create_audit_workflow()
+    workflow = get_workflow()
     config = {"configurable": {"thread_id": thread_id}}
     
+    # Initial run
+    workflow.invoke(initial_state, config=config)
+    
+    # Verify if result is comprehensive (might be halted)
+    # We can fetch latest state from graph to be sure
+    final_state_snapshot = workflow.get_state(config)
+    final_state = final_state_snapshot.values
+    
+    # Convert dict to AuditState if needed; the values come from the
+    # workflow's own (already validated) channels, so skip re-validation
+    if isinstance(final_state, dict):
+        final_state = AuditState.model_construct(**final_state)
+    
+    return final_state, bool(final_state_snapshot.next)
+
+
+def _audit_bytes(pdf_bytes: bytes, document_id: str, pdf_path: str, thread_id: str):
+    """Audit in-memory PDF bytes, spilling them to a temporary file only if there is no path."""
+    if pdf_path is not None:
+        return _execute_audit(pdf_path, document_id, thread_id)
+    
+    # Extraction opens PDFs by path; the directory is removed as soon as the run returns
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir) / f"{document_id}.pdf"
+        tmp_path.write_bytes(pdf_bytes)
+        return _execute_audit(str(tmp_path), document_id, thread_id)
+
+
+@st.cache_data(ttl=24 * 60 * 60, show_spinner=False)
+def _cached_audit(
+    pdf_bytes: bytes,
+    document_id: str,
+    provider: str,
+    demo_mode: bool,
+    _pdf_path: Optional[str],
+    _thread_id: str
+) -> dict:
+    """
+    Audit a PDF, memoized on its bytes so re-selecting an unchanged file is instant.
+    
+    provider and demo_mode are not used in the body; they only key the cache,
+    so switching provider or leaving demo mode runs a fresh audit. The agents
+    resolve their LLMs per selected provider too, so the fresh audit really
+    runs on the new provider.
+    Underscore-prefixed arguments are excluded from the cache key.
+    """
+    final_state, paused = _audit_bytes(pdf_bytes, document_id, _pdf_path, _thread_id)
+    if paused:
+        # Paused runs depend on their checkpoint thread to resume
+        raise _AuditPaused(final_state)
+    return final_state.model_dump()
+
+
+def run_live_audit(
+    pdf_bytes: bytes,
+    document_id: str,
+    pdf_path: Optional[str] = None,
+    thread_id: str = None
+):
+    """
+    Run audit with live API and persistence.
+    
+    Args:
+        pdf_bytes: PDF contents (uploads are never written to the working directory)
+        document_id: Document identifier, usually the file stem
+        pdf_path: On-disk path when the PDF already exists as a file (samples)
+        thread_id: Checkpoint thread; a new one is generated if omitted
+    """
+    from agents import AuditState
+    
+    if not thread_id:
+        thread_id = str(uuid.uuid4())
+    
     try:
-        # Initial run
-        result = workflow.invoke(initial_state, config=config)
-        
-        # Verify if result is comprehensive (might be halted)
-        # We can fetch latest state from graph to be sure
-        final_state_snapshot = workflow.get_state(config)
-        final_state = final_state_snapshot.values
-        
-        # If interrupted, final_state might not be fully updated, 
-        # but we return what we have. The UI checks .next to see if halted.
-        
-        # Convert dict to AuditState if needed
-        if isinstance(final_state, dict):
-            final_state = AuditState(**final_state)
+        try:
+            final_state = AuditState(**_cached_audit(
+                pdf_bytes,
+                document_id,
+                get_selected_provider(),
+                getattr(demo_config, "DEMO_MODE", False),
+                pdf_path,
+                thread_id
+            ))
+        except _AuditPaused as paused:
+            # The UI checks the thread's .next to offer the review controls
+            final_state = paused.final_state
             
         return final_state, thread_id, True
         
@@ -183,6 +372,167 @@ def run_live_audit(pdf_path: str, thread_id: str = None):
         return None, thread_id, False
 
 
+@st.fragment
+def render_results(state):
+    """
+    Render the results panel for a completed audit.
+    
+    Runs as a fragment, so widgets inside it (the download button) rerun
+    only this panel; New Audit still triggers a full app rerun.
+    """
+    
+    st.markdown("---")
+    
+    # Show mode used
+    if st.session_state.get('mode_used') == 'live':
+        st.success("✅ Audit completed using Live API with intelligent fallback")
+    
+    # Trust Score Gauge
+    if state.compliance:
+        col_gauge, col_details = st.columns([1, 1])
+        
+        with col_gauge:
+            fig = create_trust_score_gauge(
+                state.compliance.trust_score,
+                state.compliance.brsr_aligned
+            )
+            st.plotly_chart(fig, width='stretch')
+        
+        with col_details:
+            st.markdown("### 📊 Compliance Details")
+            
+            if state.requires_human_review:
+                st.markdown(f'<div class="warning-box">⚠️ <b>Human Review Required</b><br>{state.human_review_reason}</div>', unsafe_allow_html=True)
+                if state.human_review_decision:
+                    st.info(f"Decision: **{state.human_review_decision.upper()}**")
+            
+            st.markdown("**Recommendations:**")
+            for rec in state.compliance.recommendations:
+                st.markdown(f"- {rec}")
+    
+    st.markdown("---")
+    
+    # Thinking process
+    if state.reasoning_history:
+        display_thinking_process(state.reasoning_history)
+    
+    st.markdown("---")
+    
+    # Export
+    col_export1, col_export2 = st.columns(2)
+    
+    with col_export1:
+        st.download_button(
+            label="📥 Download Audit Report (JSON)",
+            data=export_audit_json(state),
+            file_name=f"{state.document_id}_audit_{state.audit_date.strftime('%Y%m%d_%H%M%S')}.json",
+            mime="application/json"
+        )
+    
+    with col_export2:
+        if st.button("🔄 New Audit"):
+            del st.session_state['audit_result']
+            if 'mode_used' in st.session_state:
+                del st.session_state['mode_used']
+            st.rerun()
+
+
+def _resume_review(workflow, config: dict, decision: str):
+    """Record the reviewer's decision, resume the paused audit and rerun the app."""
+    from agents import AuditState
+    
+    workflow.update_state(config, {"human_review_decision": decision})
+    # Resume
+    result = workflow.invoke(None, config=config)
+    # Update session state
+    if isinstance(result, dict):
+        st.session_state['audit_result'] = AuditState.model_construct(**result)
+    else:
+        st.session_state['audit_result'] = result
+    st.rerun()
+
+
+@st.fragment
+def render_review_panel(thread_id: str):
+    """
+    Show the pending human review controls for a paused audit.
+    
+    Runs as a fragment so a review click reruns only this panel before the
+    resumed result triggers a single full app rerun.
+    """
+    workflow = get_workflow()
+    config = {"configurable": {"thread_id": thread_id}}
+    
+    try:
+        snapshot = workflow.get_state(config)
+        next_step = snapshot.next
+        
+        if next_step and "human_review" in next_step:
+            st.markdown("---")
+            st.markdown("### 🛑 Pending Human Review")
+            st.warning("The audit has been paused because a high deviation was detected.")
+            
+            # Show reasoning
+            state_values = snapshot.values
+            if isinstance(state_values, dict):
+                reason = state_values.get("human_review_reason", "Verification deviation exceeded threshold.")
+            else:
+                reason = state_values.human_review_reason
+            
+            st.info(f"**Reason:** {reason}")
+            
+            col_rev1, col_rev2 = st.columns(2)
+            with col_rev1:
+                if st.button("✅ Confirm Flag (Reject Invoice)", type="primary"):
+                    _resume_review(workflow, config, "reject")
+                    
+            with col_rev2:
+                if st.button("⚠️ Override & Approve Invoice"):
+                    _resume_review(workflow, config, "approve")
+    except Exception as e:
+        # Checkpoint might not exist if freshly started
+        pass
+
+
+def run_live_audit_batch(pdf_paths: List[str], max_concurrency: int = 8) -> List[dict]:
+    """
+    Audit several PDFs concurrently and summarize each result.
+    
+    Batch runs use in-memory checkpoints and are never resumed, so documents
+    that need human review are reported as such rather than paused in the UI.
+    
+    Args:
+        pdf_paths: Paths to PDF invoices
+        max_concurrency: Maximum number of audits in flight at once
+        
+    Returns:
+        One summary row per document, in input order
+    """
+    from agents import AuditState, run_workflow_batch_sync
+    
+    states = [AuditState(pdf_path=pdf_path, document_id=Path(pdf_path).stem) for pdf_path in pdf_paths]
+    final_states = run_workflow_batch_sync(states, max_concurrency=max_concurrency)
+    
+    return [
+        {
+            "Document": state.document_id,
+            "Status": state.workflow_status,
+            "Trust Score": state.compliance.trust_score if state.compliance else None,
+            "BRSR Aligned": state.compliance.brsr_aligned if state.compliance else None,
+            "Deviation (%)": state.verification.deviation_percent if state.verification else None,
+            "Human Review": state.requires_human_review
+        }
+        for state in final_states
+    ]
+
+
+@st.cache_resource(show_spinner=False)
+def _load_env():
+    """Load .env once per process instead of re-parsing it on every rerun."""
+    from dotenv import load_dotenv
+    load_dotenv()
+
+
 def main():
     """Main Streamlit app."""
     
@@ -190,8 +540,7 @@ def main():
     st.markdown('<div class="main-header">🌱 GreenTrust AI</div>', unsafe_allow_html=True)
     
     # Check if API key is configured
-    from dotenv import load_dotenv
-    load_dotenv()
+    _load_env()
     api_key = os.getenv("OPENAI_API_KEY")
     
     if api_key and len(api_key) > 20:
@@ -209,24 +558,20 @@ def main():
         available = get_available_providers()
         
         if available:
-            provider_options = []
-            for prov, conf in available:
-                label = f"{prov.upper()} - {conf['description']}"
-                provider_options.append((label, prov))
+            providers = [prov for prov, _ in available]
             
             # Current provider from env
             current_provider = os.getenv("LLM_PROVIDER", "groq")
-            default_idx = next((i for i, (_, p) in enumerate(provider_options) if p == current_provider), 0)
+            default_idx = providers.index(current_provider) if current_provider in providers else 0
             
-            selected_label = st.selectbox(
+            # Options are the provider names themselves; labels are display-only
+            selected_provider = st.selectbox(
                 "Select Provider:",
-                [label for label, _ in provider_options],
-                index=default_idx
+                providers,
+                index=default_idx,
+                format_func=lambda prov: f"{prov.upper()} - {PROVIDER_CONFIGS[prov]['description']}"
             )
             
-            # Get selected provider
-            selected_provider = next(prov for label, prov in provider_options if label == selected_label)
-            
             # Update environment variable
             os.environ["LLM_PROVIDER"] = selected_provider
             
@@ -238,32 +583,13 @@ def main():
         
         st.markdown("---")
         st.markdown("### 📊 About")
-        st.info(f"""
-        **GreenTrust AI** uses multi-agent AI to audit carbon emission claims.
-        
-        **Agents:**
-        - 📄 Extraction Agent (with regex fallback)
-        - 🔍 Verification Agent
-        - ✅ Compliance Agent
-        - 👤 Human Review
-        
-        **Fallback**: {'✅ Enabled' if os.getenv('ENABLE_FALLBACK', 'true') == 'true' else '❌ Disabled'}
-        """)
+        fallback_enabled = os.getenv('ENABLE_FALLBACK', 'true') == 'true'
+        st.info(ABOUT_TEMPLATE.format(fallback='✅ Enabled' if fallback_enabled else '❌ Disabled'))
         
         st.markdown("---")
         st.markdown("### 📁 Sample Invoices")
         
-        sample_files = [
-            "valid_invoice.pdf",
-            "suspicious_invoice.pdf",
-            "edge_case_missing_date.pdf",
-            "edge_case_eur_currency.pdf",
-            "edge_case_high_risk_region.pdf",
-            "edge_case_multimodal.pdf",
-            "edge_case_zero_emissions.pdf"
-        ]
-        
-        selected_sample = st.selectbox("Select invoice:", sample_files)
+        selected_sample = st.selectbox("Select invoice:", SAMPLE_FILES)
     
     # Main content
     col1, col2 = st.columns([1, 1])
@@ -280,19 +606,20 @@ def main():
         
         # Determine which file to use
         if uploaded_file:
-            # Save uploaded file temporarily
-            pdf_path = f"temp_{uploaded_file.name}"
-            with open(pdf_path, "wb") as f:
-                f.write(uploaded_file.getbuffer())
+            # Keep the upload in memory; it only touches disk on a cache miss
+            pdf_path = None
+            document_id = Path(uploaded_file.name).stem
             st.success(f"✅ Uploaded: {uploaded_file.name}")
         else:
             # Use selected sample
             pdf_path = f"data_samples/{selected_sample}"
+            document_id = Path(pdf_path).stem
             st.info(f"📁 Using sample: {selected_sample}")
         
         if st.button("🚀 Run Audit", type="primary"):
             with st.spinner("Running audit..."):
-                final_state, thread_id, success = run_live_audit(pdf_path)
+                pdf_bytes = uploaded_file.getvalue() if uploaded_file else Path(pdf_path).read_bytes()
+                final_state, thread_id, success = run_live_audit(pdf_bytes, document_id, pdf_path)
                 
                 if success and final_state:
                     st.session_state['audit_result'] = final_state
@@ -301,81 +628,54 @@ def main():
                     st.rerun()
                 else:
                     st.error("Audit failed. Check logs for details.")
-
-    # Check for HITL Interruption (Pending Review)
-    if 'thread_id' in st.session_state and 'audit_result' in st.session_state:
-        thread_id = st.session_state['thread_id']
-        workflow = create_audit_workflow()
-        config = {"configurable": {"thread_id": thread_id}}
         
-        try:
-            snapshot = workflow.get_state(config)
-            next_step = snapshot.next
-            
-            if next_step and "human_review" in next_step:
-                st.markdown("---")
-                st.markdown("### 🛑 Pending Human Review")
-                st.warning("The audit has been paused because a high deviation was detected.")
-                
-                # Show reasoning
-                state_values = snapshot.values
-                if isinstance(state_values, dict):
-                    reason = state_values.get("human_review_reason", "Verification deviation exceeded threshold.")
-                else:
-                    reason = state_values.human_review_reason
-                
-                st.info(f"**Reason:** {reason}")
-                
-                col_rev1, col_rev2 = st.columns(2)
-                with col_rev1:
-                    if st.button("✅ Confirm Flag (Reject Invoice)", type="primary"):
-                        workflow.update_state(config, {"human_review_decision": "reject"})
-                        # Resume
-                        result = workflow.invoke(None, config=config)
-                        # Update session state
-                        if isinstance(result, dict):
-                            st.session_state['audit_result'] = AuditState(**result)
-                        else:
-                            st.session_state['audit_result'] = result
-                        st.rerun()
-                        
-                with col_rev2:
-                    if st.button("⚠️ Override & Approve Invoice"):
-                        workflow.update_state(config, {"human_review_decision": "approve"})
-                        # Resume
-                        result = workflow.invoke(None, config=config)
-                        # Update session state
-                        if isinstance(result, dict):
-                            st.session_state['audit_result'] = AuditState(**result)
-                        else:
-                            st.session_state['audit_result'] = result
-                        st.rerun()
-        except Exception as e:
-            # Checkpoint might not exist if freshly started
-            pass
+        if st.button("📚 Run Batch Audit (all samples)"):
+            with st.spinner(f"Auditing {len(SAMPLE_FILES)} invoices concurrently..."):
+                st.session_state['batch_results'] = run_live_audit_batch(
+                    [f"data_samples/{name}" for name in SAMPLE_FILES]
+                )
+        
+        if 'batch_results' in st.session_state:
+            st.markdown("#### 📚 Batch Results")
+            st.dataframe(st.session_state['batch_results'], hide_index=True)
+
+    # Check for HITL Interruption (Pending Review). The workflow only pauses
+    # when review is required and not yet done, so other results skip the
+    # checkpoint read on every rerun
+    audit_result = st.session_state.get('audit_result')
+    review_pending = (
+        audit_result is not None
+        and audit_result.requires_human_review
+        and not audit_result.human_review_completed
+    )
+    if 'thread_id' in st.session_state and review_pending:
+        render_review_panel(st.session_state['thread_id'])
     
     with col2:
         st.markdown("### 📋 Quick Stats")
         if 'audit_result' in st.session_state:
             state = st.session_state['audit_result']
             
+            co2e_claimed = state.extraction.co2e_claimed if state.extraction else None
+            benchmark_co2e = state.verification.benchmark_co2e if state.verification else None
+            deviation = state.verification.deviation_percent if state.verification else None
+            
             metric_col1, metric_col2, metric_col3 = st.columns(3)
             
             with metric_col1:
-                if state.extraction and state.extraction.co2e_claimed:
-                    st.metric("CO2e Claimed", f"{state.extraction.co2e_claimed:.1f} kg")
+                if co2e_claimed:
+                    st.metric("CO2e Claimed", f"{co2e_claimed:.1f} kg")
                 else:
                     st.metric("CO2e Claimed", "N/A")
             
             with metric_col2:
-                if state.verification and state.verification.benchmark_co2e:
-                    st.metric("Benchmark", f"{state.verification.benchmark_co2e:.1f} kg")
+                if benchmark_co2e:
+                    st.metric("Benchmark", f"{benchmark_co2e:.1f} kg")
                 else:
                     st.metric("Benchmark", "N/A")
             
             with metric_col3:
-                if state.verification and state.verification.deviation_percent is not None:
-                    deviation = state.verification.deviation_percent
+                if deviation is not None:
                     st.metric("Deviation", f"{deviation:.1f}%", delta=f"{deviation:.1f}%", delta_color="inverse")
                 else:
                     st.metric("Deviation", "N/A")
@@ -384,93 +684,15 @@ def main():
     
     # Results section
     if 'audit_result' in st.session_state:
-        state = st.session_state['audit_result']
-        
-        st.markdown("---")
-        
-        # Show mode used
-        if st.session_state.get('mode_used') == 'live':
-            st.success("✅ Audit completed using Live API with intelligent fallback")
-        
-        # Trust Score Gauge
-        if state.compliance:
-            col_gauge, col_details = st.columns([1, 1])
-            
-            with col_gauge:
-                fig = create_trust_score_gauge(
-                    state.compliance.trust_score,
-                    state.compliance.brsr_aligned
-                )
-                st.plotly_chart(fig, width='stretch')
-                
-                if state.compliance.brsr_aligned:
-                    st.markdown('<div class="success-box">✅ <b>SEBI BRSR Aligned</b></div>', unsafe_allow_html=True)
-                else:
-                    st.markdown('<div class="error-box">❌ <b>Not SEBI BRSR Aligned</b></div>', unsafe_allow_html=True)
-            
-            with col_details:
-                st.markdown("### 📊 Compliance Details")
-                
-                if state.requires_human_review:
-                    st.markdown(f'<div class="warning-box">⚠️ <b>Human Review Required</b><br>{state.human_review_reason}</div>', unsafe_allow_html=True)
-                    if state.human_review_decision:
-                        st.info(f"Decision: **{state.human_review_decision.upper()}**")
-                
-                st.markdown("**Recommendations:**")
-                for rec in state.compliance.recommendations:
-                    st.markdown(f"- {rec}")
-        
-        st.markdown("---")
-        
-        # Thinking process
-        if state.reasoning_history:
-            display_thinking_process(state.reasoning_history)
-        
-        st.markdown("---")
-        
-        # Export
-        col_export1, col_export2 = st.columns(2)
-        
-        with col_export1:
-            export_data = {
-                "document_id": state.document_id,
-                "audit_date": state.audit_date.isoformat(),
-                "workflow_status": state.workflow_status,
-                "extraction": state.extraction.model_dump() if state.extraction else None,
-                "verification": state.verification.model_dump() if state.verification else None,
-                "compliance": state.compliance.model_dump() if state.compliance else None,
-                "reasoning_history": [
-                    {
-                        "agent": step.agent,
-                        "timestamp": step.timestamp.isoformat(),
-                        "action": step.action,
-                        "reasoning": step.reasoning,
-                        "result": step.result
-                    }
-                    for step in state.reasoning_history
-                ],
-                "human_review": {
-                    "required": state.requires_human_review,
-                    "reason": state.human_review_reason,
-                    "completed": state.human_review_completed,
-                    "decision": state.human_review_decision
-                }
-            }
-            
-            st.download_button(
-                label="📥 Download Audit Report (JSON)",
-                data=json.dumps(export_data, indent=2),
-                file_name=f"{state.document_id}_audit_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
-                mime="application/json"
-            )
-        
-        with col_export2:
-            if st.button("🔄 New Audit"):
-                del st.session_state['audit_result']
-                if 'mode_used' in st.session_state:
-                    del st.session_state['mode_used']
-                st.rerun()
+        render_results(st.session_state['audit_result'])
 
 
 if __name__ == "__main__":
-    main()
+    _load_env()
+    if os.getenv("ENABLE_PROFILER", "false").lower() == "true":
+        # Per-rerun pyinstrument profile rendered below the app (pip install streamlit-profiler)
+        from streamlit_profiler import Profiler
+        with Profiler():
+            main()
+    else:
+        main()
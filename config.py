@@ -28,6 +28,15 @@ LLM_MODEL = os.getenv("LLM_MODEL", "llama-3.3-70b-versatile")  # Default: Groq m
 LLM_TEMPERATURE = float(os.getenv("LLM_TEMPERATURE", "0.0"))
 ENABLE_FALLBACK = os.getenv("ENABLE_FALLBACK", "true").lower() == "true"
 
+# Workflow checkpoints (SQLite, used to resume human-review interrupts)
+CHECKPOINT_DB_PATH = os.getenv("CHECKPOINT_DB_PATH", "checkpoints.db")
+
+# LLM Response Cache (exact match on rendered prompt)
+ENABLE_LLM_CACHE = os.getenv("ENABLE_LLM_CACHE", "true").lower() == "true"
+LLM_CACHE_PATH = Path(os.getenv("LLM_CACHE_PATH", PROJECT_ROOT / "llm_cache.db"))
+LLM_CACHE_TTL_DAYS = float(os.getenv("LLM_CACHE_TTL_DAYS", "30"))  # Entries older than this are ignored and pruned
+LLM_CACHE_MAX_ROWS = int(os.getenv("LLM_CACHE_MAX_ROWS", "10000"))  # Oldest entries beyond this are pruned
+
 # SEBI BRSR Compliance Thresholds
 BRSR_THRESHOLDS = {
     "max_deviation_percent": 15.0,  # Maximum acceptable deviation from benchmark
@@ -42,6 +51,7 @@ EXTRACTION_CONFIG = {
     "chunk_size": 1000,  # Characters per chunk for LLM processing
     "overlap": 200,  # Overlap between chunks
     "max_pages": 50,  # Maximum pages to process per PDF
+    "regex_validated_confidence": 0.85,  # Confidence recorded when a validated regex extraction skips the LLM
 }
 
 # Verification Settings
@@ -50,5 +60,34 @@ VERIFICATION_CONFIG = {
     "retry_attempts": 3,  # Number of retry attempts for verification
 }
 
+# LLM provider circuit breaker
+CIRCUIT_BREAKER_CONFIG = {
+    "failure_threshold": 3,  # Consecutive failures before a provider is skipped
+    "cooldown_seconds": 30.0,  # Initial skip window (doubles on each consecutive trip)
+    "max_cooldown_seconds": 600.0,  # Upper bound on the skip window
+}
+
+# Adaptive per-provider LLM call timeouts (derived from observed p95 latency)
+LLM_TIMEOUT_CONFIG = {
+    "initial_timeout": 30.0,  # Timeout used until enough latencies have been observed
+    "min_timeout": 5.0,  # Lower bound on the adaptive timeout (seconds)
+    "max_timeout": 60.0,  # Upper bound on the adaptive timeout (seconds)
+    "p95_multiplier": 2.0,  # Timeout = p95 latency * multiplier
+    "window": 100,  # Number of recent successful latencies tracked per provider
+    "min_samples": 5,  # Samples required before the p95 is trusted
+}
+
+# Worker threads for timed LLM calls. A timed-out call keeps its worker until the
+# client's own request timeout (LLM_TIMEOUT_CONFIG["max_timeout"]) ends it;
+# once every worker is busy, new calls fail fast without tripping the breaker.
+LLM_CALL_MAX_WORKERS = int(os.getenv("LLM_CALL_MAX_WORKERS", "32"))
+
+# RAGAS evaluation: metric/sample jobs run concurrently inside ragas.evaluate
+RAGAS_RUN_CONFIG = {
+    "max_workers": 8,  # Concurrent evaluator LLM calls (keep under provider rate limits)
+    "timeout": 60,  # Per-call timeout (seconds)
+    "max_wait": 60,  # Maximum backoff between retries (seconds)
+}
+
 # Logging
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
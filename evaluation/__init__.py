@@ -2,6 +2,6 @@
 Evaluation module initialization.
 """
 
-from .ragas_setup import evaluate_audit_faithfulness
+from .ragas_setup import evaluate_audit_faithfulness, evaluate_audit_faithfulness_batch
 
-__all__ = ["evaluate_audit_faithfulness"]
+__all__ = ["evaluate_audit_faithfulness", "evaluate_audit_faithfulness_batch"]
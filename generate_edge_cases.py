@@ -9,7 +9,46 @@ from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
 from reportlab.lib import colors
 from reportlab.lib.enums import TA_CENTER
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
+import os
+
+# Palette, parsed once per process
+BLUE = colors.HexColor('#1976D2')
+GREEN = colors.HexColor('#2E7D32')
+RED = colors.HexColor('#C62828')
+ORANGE = colors.HexColor('#F57C00')
+LIGHT_GREEN = colors.HexColor('#4CAF50')
+GREEN_BG = colors.HexColor('#E8F5E9')
+RED_BG = colors.HexColor('#FFEBEE')
+ORANGE_BG = colors.HexColor('#FFF3E0')
+BLUE_BG = colors.HexColor('#E3F2FD')
+MINT_BG = colors.HexColor('#C8E6C9')
+
+# Shared styles, built once per process instead of once per PDF
+STYLES = getSampleStyleSheet()
+
+
+def _title_style(color: colors.Color) -> ParagraphStyle:
+    """Centered invoice title in the given colour."""
+    return ParagraphStyle(
+        'CustomTitle',
+        parent=STYLES['Heading1'],
+        fontSize=22,
+        textColor=color,
+        spaceAfter=20,
+        alignment=TA_CENTER
+    )
+
+
+TITLE_BLUE = _title_style(BLUE)
+TITLE_GREEN = _title_style(GREEN)
+TITLE_RED = _title_style(RED)
+TITLE_ORANGE = _title_style(ORANGE)
+TITLE_LIGHT_GREEN = _title_style(LIGHT_GREEN)
+NOTE_STYLE = ParagraphStyle('Note', parent=STYLES['Normal'], fontSize=8, textColor=colors.grey)
+WARNING_STYLE = ParagraphStyle('Warning', parent=STYLES['Normal'], fontSize=9, textColor=colors.red)
+PLAIN_TABLE_STYLE = TableStyle([('FONTNAME', (0,0), (-1,-1), 'Helvetica')])
 
 
 def create_edge_case_missing_date():
@@ -18,16 +57,8 @@ def create_edge_case_missing_date():
     pdf_path = Path("data_samples/edge_case_missing_date.pdf")
     doc = SimpleDocTemplate(str(pdf_path), pagesize=letter)
     story = []
-    styles = getSampleStyleSheet()
-    
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=22,
-        textColor=colors.HexColor('#1976D2'),
-        spaceAfter=20,
-        alignment=TA_CENTER
-    )
+    styles = STYLES
+    title_style = TITLE_BLUE
     
     story.append(Paragraph("SWIFT CARGO SERVICES", title_style))
     story.append(Spacer(1, 0.2*inch))
@@ -62,7 +93,7 @@ def create_edge_case_missing_date():
     ]
     
     t2 = Table(shipment_data, colWidths=[2*inch, 3.5*inch])
-    t2.setStyle(TableStyle([('FONTNAME', (0,0), (-1,-1), 'Helvetica')]))
+    t2.setStyle(PLAIN_TABLE_STYLE)
     story.append(t2)
     story.append(Spacer(1, 0.2*inch))
     
@@ -76,7 +107,7 @@ def create_edge_case_missing_date():
     
     t3 = Table(env_data, colWidths=[2.5*inch, 3*inch])
     t3.setStyle(TableStyle([
-        ('BACKGROUND', (0,0), (-1,0), colors.HexColor('#E3F2FD'))
+        ('BACKGROUND', (0,0), (-1,0), BLUE_BG)
     ]))
     story.append(t3)
     
@@ -91,16 +122,8 @@ def create_edge_case_eur_currency():
     pdf_path = Path("data_samples/edge_case_eur_currency.pdf")
     doc = SimpleDocTemplate(str(pdf_path), pagesize=letter)
     story = []
-    styles = getSampleStyleSheet()
-    
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=22,
-        textColor=colors.HexColor('#2E7D32'),
-        spaceAfter=20,
-        alignment=TA_CENTER
-    )
+    styles = STYLES
+    title_style = TITLE_GREEN
     
     story.append(Paragraph("EUROFREIGHT LOGISTICS GmbH", title_style))
     story.append(Paragraph("International Shipping Solutions", styles['Normal']))
@@ -117,7 +140,7 @@ def create_edge_case_eur_currency():
     ]
     
     t = Table(invoice_data, colWidths=[2*inch, 3*inch])
-    t.setStyle(TableStyle([('FONTNAME', (0,0), (-1,-1), 'Helvetica')]))
+    t.setStyle(PLAIN_TABLE_STYLE)
     story.append(t)
     story.append(Spacer(1, 0.3*inch))
     
@@ -133,7 +156,7 @@ def create_edge_case_eur_currency():
     ]
     
     t2 = Table(shipment_data, colWidths=[2*inch, 3.5*inch])
-    t2.setStyle(TableStyle([('FONTNAME', (0,0), (-1,-1), 'Helvetica')]))
+    t2.setStyle(PLAIN_TABLE_STYLE)
     story.append(t2)
     story.append(Spacer(1, 0.2*inch))
     
@@ -148,13 +171,13 @@ def create_edge_case_eur_currency():
     
     t3 = Table(env_data, colWidths=[2.5*inch, 3*inch])
     t3.setStyle(TableStyle([
-        ('BACKGROUND', (0,0), (-1,0), colors.HexColor('#E8F5E9'))
+        ('BACKGROUND', (0,0), (-1,0), GREEN_BG)
     ]))
     story.append(t3)
     
     story.append(Spacer(1, 0.2*inch))
     story.append(Paragraph("<i>Note: All amounts in EUR. Convert to INR at current exchange rate for reporting.</i>", 
-                          ParagraphStyle('Note', parent=styles['Normal'], fontSize=8, textColor=colors.grey)))
+                          NOTE_STYLE))
     
     doc.build(story)
     print(f"Created: {pdf_path}")
@@ -167,16 +190,8 @@ def create_edge_case_high_risk_region():
     pdf_path = Path("data_samples/edge_case_high_risk_region.pdf")
     doc = SimpleDocTemplate(str(pdf_path), pagesize=letter)
     story = []
-    styles = getSampleStyleSheet()
-    
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=22,
-        textColor=colors.HexColor('#C62828'),
-        spaceAfter=20,
-        alignment=TA_CENTER
-    )
+    styles = STYLES
+    title_style = TITLE_RED
     
     story.append(Paragraph("BORDER LOGISTICS LLC", title_style))
     story.append(Paragraph("Cross-Border Transport Services", styles['Normal']))
@@ -195,7 +210,7 @@ def create_edge_case_high_risk_region():
     t = Table(invoice_data, colWidths=[2*inch, 3*inch])
     t.setStyle(TableStyle([
         ('FONTNAME', (0,0), (-1,-1), 'Helvetica'),
-        ('BACKGROUND', (0,3), (-1,3), colors.HexColor('#FFEBEE'))
+        ('BACKGROUND', (0,3), (-1,3), RED_BG)
     ]))
     story.append(t)
     story.append(Spacer(1, 0.3*inch))
@@ -230,14 +245,14 @@ def create_edge_case_high_risk_region():
     
     t3 = Table(env_data, colWidths=[2.5*inch, 3*inch])
     t3.setStyle(TableStyle([
-        ('BACKGROUND', (0,0), (-1,0), colors.HexColor('#FFEBEE')),
+        ('BACKGROUND', (0,0), (-1,0), RED_BG),
         ('TEXTCOLOR', (0,3), (-1,3), colors.red)
     ]))
     story.append(t3)
     
     story.append(Spacer(1, 0.2*inch))
     story.append(Paragraph("<b>WARNING:</b> Shipment from conflict zone. Enhanced due diligence required.", 
-                          ParagraphStyle('Warning', parent=styles['Normal'], fontSize=9, textColor=colors.red)))
+                          WARNING_STYLE))
     
     doc.build(story)
     print(f"Created: {pdf_path}")
@@ -250,16 +265,8 @@ def create_edge_case_multimodal():
     pdf_path = Path("data_samples/edge_case_multimodal.pdf")
     doc = SimpleDocTemplate(str(pdf_path), pagesize=letter)
     story = []
-    styles = getSampleStyleSheet()
-    
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=22,
-        textColor=colors.HexColor('#F57C00'),
-        spaceAfter=20,
-        alignment=TA_CENTER
-    )
+    styles = STYLES
+    title_style = TITLE_ORANGE
     
     story.append(Paragraph("GLOBAL MULTIMODAL LOGISTICS", title_style))
     story.append(Paragraph("Integrated Transport Solutions", styles['Normal']))
@@ -276,7 +283,7 @@ def create_edge_case_multimodal():
     ]
     
     t = Table(invoice_data, colWidths=[2*inch, 3*inch])
-    t.setStyle(TableStyle([('FONTNAME', (0,0), (-1,-1), 'Helvetica')]))
+    t.setStyle(PLAIN_TABLE_STYLE)
     story.append(t)
     story.append(Spacer(1, 0.3*inch))
     
@@ -294,7 +301,7 @@ def create_edge_case_multimodal():
     t2.setStyle(TableStyle([
         ('FONTNAME', (0,0), (-1,-1), 'Helvetica'),
         ('FONTSIZE', (0,0), (-1,-1), 9),
-        ('BACKGROUND', (0,0), (-1,0), colors.HexColor('#FFF3E0')),
+        ('BACKGROUND', (0,0), (-1,0), ORANGE_BG),
         ('GRID', (0,0), (-1,-1), 0.5, colors.grey)
     ]))
     story.append(t2)
@@ -311,7 +318,7 @@ def create_edge_case_multimodal():
     
     t3 = Table(env_data, colWidths=[2.5*inch, 3*inch])
     t3.setStyle(TableStyle([
-        ('BACKGROUND', (0,0), (-1,0), colors.HexColor('#FFF3E0'))
+        ('BACKGROUND', (0,0), (-1,0), ORANGE_BG)
     ]))
     story.append(t3)
     
@@ -326,18 +333,10 @@ def create_edge_case_zero_emissions():
     pdf_path = Path("data_samples/edge_case_zero_emissions.pdf")
     doc = SimpleDocTemplate(str(pdf_path), pagesize=letter)
     story = []
-    styles = getSampleStyleSheet()
-    
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=22,
-        textColor=colors.HexColor('#4CAF50'),
-        spaceAfter=20,
-        alignment=TA_CENTER
-    )
+    styles = STYLES
+    title_style = TITLE_LIGHT_GREEN
     
-    story.append(Paragraph("🌿 GREENWAY ECO-LOGISTICS 🌿", title_style))
+    story.append(Paragraph("GREENWAY ECO-LOGISTICS", title_style))
     story.append(Paragraph("100% Carbon Neutral Shipping - Certified Green", styles['Normal']))
     story.append(Spacer(1, 0.2*inch))
     
@@ -352,7 +351,7 @@ def create_edge_case_zero_emissions():
     ]
     
     t = Table(invoice_data, colWidths=[2*inch, 3*inch])
-    t.setStyle(TableStyle([('FONTNAME', (0,0), (-1,-1), 'Helvetica')]))
+    t.setStyle(PLAIN_TABLE_STYLE)
     story.append(t)
     story.append(Spacer(1, 0.3*inch))
     
@@ -367,7 +366,7 @@ def create_edge_case_zero_emissions():
     ]
     
     t2 = Table(shipment_data, colWidths=[2*inch, 3.5*inch])
-    t2.setStyle(TableStyle([('FONTNAME', (0,0), (-1,-1), 'Helvetica')]))
+    t2.setStyle(PLAIN_TABLE_STYLE)
     story.append(t2)
     story.append(Spacer(1, 0.2*inch))
     
@@ -384,7 +383,7 @@ def create_edge_case_zero_emissions():
     
     t3 = Table(env_data, colWidths=[2.5*inch, 3*inch])
     t3.setStyle(TableStyle([
-        ('BACKGROUND', (0,2), (-1,2), colors.HexColor('#C8E6C9')),
+        ('BACKGROUND', (0,2), (-1,2), MINT_BG),
         ('FONTNAME', (0,2), (-1,2), 'Helvetica-Bold')
     ]))
     story.append(t3)
@@ -392,7 +391,7 @@ def create_edge_case_zero_emissions():
     story.append(Spacer(1, 0.2*inch))
     story.append(Paragraph("<b>Note:</b> Carbon offsets are voluntary and not independently verified. " +
                           "Actual emissions calculated at 50.4 kg CO2e before offsets.", 
-                          ParagraphStyle('Note', parent=styles['Normal'], fontSize=8, textColor=colors.grey)))
+                          NOTE_STYLE))
     
     doc.build(story)
     print(f"Created: {pdf_path}")
@@ -404,11 +403,19 @@ if __name__ == "__main__":
     print("GENERATING EDGE CASE INVOICES")
     print("="*60 + "\n")
     
-    create_edge_case_missing_date()
-    create_edge_case_eur_currency()
-    create_edge_case_high_risk_region()
-    create_edge_case_multimodal()
-    create_edge_case_zero_emissions()
+    builders = [
+        create_edge_case_missing_date,
+        create_edge_case_eur_currency,
+        create_edge_case_high_risk_region,
+        create_edge_case_multimodal,
+        create_edge_case_zero_emissions,
+    ]
+    
+    # Each PDF is an independent, CPU-bound ReportLab render
+    with ProcessPoolExecutor(max_workers=min(len(builders), os.cpu_count() or 1)) as executor:
+        futures = [executor.submit(build) for build in builders]
+        for future in as_completed(futures):
+            future.result()  # Re-raise any build error
     
     print("\n" + "="*60)
     print("ALL EDGE CASE INVOICES GENERATED!")
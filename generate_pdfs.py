@@ -9,34 +9,77 @@ from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
 from reportlab.lib import colors
 from reportlab.lib.enums import TA_CENTER, TA_RIGHT
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
+import os
 
+# Palette, parsed once per process
+BLUE = colors.HexColor('#1976D2')
+GREEN = colors.HexColor('#2E7D32')
+RED = colors.HexColor('#C62828')
+BRIGHT_RED = colors.HexColor('#D32F2F')
+GREEN_BG = colors.HexColor('#E8F5E9')
+RED_BG = colors.HexColor('#FFEBEE')
 
-def create_valid_invoice():
-    """Create a valid invoice PDF with acceptable emissions."""
-    
-    pdf_path = Path("data_samples/valid_invoice.pdf")
-    doc = SimpleDocTemplate(str(pdf_path), pagesize=letter)
-    story = []
-    styles = getSampleStyleSheet()
-    
-    # Custom styles
-    title_style = ParagraphStyle(
+# Shared styles, built once per process instead of once per PDF
+STYLES = getSampleStyleSheet()
+
+
+def _title_style(color: colors.Color) -> ParagraphStyle:
+    """Centered invoice title in the given colour."""
+    return ParagraphStyle(
         'CustomTitle',
-        parent=styles['Heading1'],
+        parent=STYLES['Heading1'],
         fontSize=24,
-        textColor=colors.HexColor('#2E7D32'),
+        textColor=color,
         spaceAfter=30,
         alignment=TA_CENTER
     )
-    
-    header_style = ParagraphStyle(
+
+
+def _header_style(color: colors.Color) -> ParagraphStyle:
+    """Section header in the given colour."""
+    return ParagraphStyle(
         'CustomHeader',
-        parent=styles['Heading2'],
+        parent=STYLES['Heading2'],
         fontSize=14,
-        textColor=colors.HexColor('#1976D2'),
+        textColor=color,
         spaceAfter=12
     )
+
+
+VALID_TITLE_STYLE = _title_style(GREEN)
+VALID_HEADER_STYLE = _header_style(BLUE)
+SUSPICIOUS_TITLE_STYLE = _title_style(RED)
+SUSPICIOUS_HEADER_STYLE = _header_style(BRIGHT_RED)
+FOOTER_STYLE = ParagraphStyle('Footer', parent=STYLES['Normal'], fontSize=8, textColor=colors.grey, alignment=TA_CENTER)
+WARNING_STYLE = ParagraphStyle('Warning', parent=STYLES['Normal'], fontSize=9, textColor=colors.red)
+
+# Table styles shared by both invoices (header block and two-column details)
+HEADER_TABLE_STYLE = TableStyle([
+    ('FONTNAME', (0,0), (-1,-1), 'Helvetica'),
+    ('FONTSIZE', (0,0), (-1,-1), 10),
+    ('TEXTCOLOR', (0,0), (0,-1), colors.grey),
+    ('TEXTCOLOR', (2,0), (2,-1), colors.grey),
+    ('ALIGN', (0,0), (-1,-1), 'LEFT'),
+])
+DETAILS_TABLE_STYLE = TableStyle([
+    ('FONTNAME', (0,0), (-1,-1), 'Helvetica'),
+    ('FONTSIZE', (0,0), (-1,-1), 10),
+    ('TEXTCOLOR', (0,0), (0,-1), colors.grey),
+    ('VALIGN', (0,0), (-1,-1), 'TOP'),
+])
+
+
+def create_valid_invoice():
+    """Create a valid invoice PDF with acceptable emissions."""
+    
+    pdf_path = Path("data_samples/valid_invoice.pdf")
+    doc = SimpleDocTemplate(str(pdf_path), pagesize=letter)
+    story = []
+    styles = STYLES
+    title_style = VALID_TITLE_STYLE
+    header_style = VALID_HEADER_STYLE
     
     # Title
     story.append(Paragraph("GLOBAL LOGISTICS CO.", title_style))
@@ -54,13 +97,7 @@ def create_valid_invoice():
     ]
     
     t = Table(invoice_data, colWidths=[1.5*inch, 2*inch, 1*inch, 2*inch])
-    t.setStyle(TableStyle([
-        ('FONTNAME', (0,0), (-1,-1), 'Helvetica'),
-        ('FONTSIZE', (0,0), (-1,-1), 10),
-        ('TEXTCOLOR', (0,0), (0,-1), colors.grey),
-        ('TEXTCOLOR', (2,0), (2,-1), colors.grey),
-        ('ALIGN', (0,0), (-1,-1), 'LEFT'),
-    ]))
+    t.setStyle(HEADER_TABLE_STYLE)
     story.append(t)
     story.append(Spacer(1, 0.3*inch))
     
@@ -77,12 +114,7 @@ def create_valid_invoice():
     ]
     
     t2 = Table(shipment_data, colWidths=[2*inch, 4*inch])
-    t2.setStyle(TableStyle([
-        ('FONTNAME', (0,0), (-1,-1), 'Helvetica'),
-        ('FONTSIZE', (0,0), (-1,-1), 10),
-        ('TEXTCOLOR', (0,0), (0,-1), colors.grey),
-        ('VALIGN', (0,0), (-1,-1), 'TOP'),
-    ]))
+    t2.setStyle(DETAILS_TABLE_STYLE)
     story.append(t2)
     story.append(Spacer(1, 0.3*inch))
     
@@ -105,8 +137,8 @@ def create_valid_invoice():
     t3.setStyle(TableStyle([
         ('FONTNAME', (0,0), (-1,-1), 'Helvetica'),
         ('FONTSIZE', (0,0), (-1,-1), 10),
-        ('TEXTCOLOR', (0,0), (0,-1), colors.HexColor('#2E7D32')),
-        ('BACKGROUND', (0,3), (-1,3), colors.HexColor('#E8F5E9')),
+        ('TEXTCOLOR', (0,0), (0,-1), GREEN),
+        ('BACKGROUND', (0,3), (-1,3), GREEN_BG),
         ('VALIGN', (0,0), (-1,-1), 'TOP'),
     ]))
     story.append(t3)
@@ -116,7 +148,7 @@ def create_valid_invoice():
     story.append(Paragraph("For queries contact: logistics@globallogistics.in | Phone: +91-22-2345-6789", styles['Normal']))
     story.append(Spacer(1, 0.2*inch))
     story.append(Paragraph("This document is computer generated and requires no signature", 
-                          ParagraphStyle('Footer', parent=styles['Normal'], fontSize=8, textColor=colors.grey, alignment=TA_CENTER)))
+                          FOOTER_STYLE))
     
     # Build PDF
     doc.build(story)
@@ -130,25 +162,9 @@ def create_suspicious_invoice():
     pdf_path = Path("data_samples/suspicious_invoice.pdf")
     doc = SimpleDocTemplate(str(pdf_path), pagesize=letter)
     story = []
-    styles = getSampleStyleSheet()
-    
-    # Custom styles
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        textColor=colors.HexColor('#C62828'),
-        spaceAfter=30,
-        alignment=TA_CENTER
-    )
-    
-    header_style = ParagraphStyle(
-        'CustomHeader',
-        parent=styles['Heading2'],
-        fontSize=14,
-        textColor=colors.HexColor('#D32F2F'),
-        spaceAfter=12
-    )
+    styles = STYLES
+    title_style = SUSPICIOUS_TITLE_STYLE
+    header_style = SUSPICIOUS_HEADER_STYLE
     
     # Title
     story.append(Paragraph("QUICK FREIGHT SERVICES", title_style))
@@ -166,13 +182,7 @@ def create_suspicious_invoice():
     ]
     
     t = Table(invoice_data, colWidths=[1.5*inch, 2*inch, 1*inch, 2*inch])
-    t.setStyle(TableStyle([
-        ('FONTNAME', (0,0), (-1,-1), 'Helvetica'),
-        ('FONTSIZE', (0,0), (-1,-1), 10),
-        ('TEXTCOLOR', (0,0), (0,-1), colors.grey),
-        ('TEXTCOLOR', (2,0), (2,-1), colors.grey),
-        ('ALIGN', (0,0), (-1,-1), 'LEFT'),
-    ]))
+    t.setStyle(HEADER_TABLE_STYLE)
     story.append(t)
     story.append(Spacer(1, 0.3*inch))
     
@@ -189,12 +199,7 @@ def create_suspicious_invoice():
     ]
     
     t2 = Table(shipment_data, colWidths=[2*inch, 4*inch])
-    t2.setStyle(TableStyle([
-        ('FONTNAME', (0,0), (-1,-1), 'Helvetica'),
-        ('FONTSIZE', (0,0), (-1,-1), 10),
-        ('TEXTCOLOR', (0,0), (0,-1), colors.grey),
-        ('VALIGN', (0,0), (-1,-1), 'TOP'),
-    ]))
+    t2.setStyle(DETAILS_TABLE_STYLE)
     story.append(t2)
     story.append(Spacer(1, 0.3*inch))
     
@@ -217,8 +222,8 @@ def create_suspicious_invoice():
     t3.setStyle(TableStyle([
         ('FONTNAME', (0,0), (-1,-1), 'Helvetica'),
         ('FONTSIZE', (0,0), (-1,-1), 10),
-        ('TEXTCOLOR', (0,0), (0,-1), colors.HexColor('#C62828')),
-        ('BACKGROUND', (0,3), (-1,3), colors.HexColor('#FFEBEE')),
+        ('TEXTCOLOR', (0,0), (0,-1), RED),
+        ('BACKGROUND', (0,3), (-1,3), RED_BG),
         ('VALIGN', (0,0), (-1,-1), 'TOP'),
     ]))
     story.append(t3)
@@ -227,14 +232,14 @@ def create_suspicious_invoice():
     # Warning note
     story.append(Paragraph("<b>Note:</b> Emission values calculated using proprietary methodology. " +
                           "Third-party verification pending.", 
-                          ParagraphStyle('Warning', parent=styles['Normal'], fontSize=9, textColor=colors.red)))
+                          WARNING_STYLE))
     story.append(Spacer(1, 0.2*inch))
     
     # Footer
     story.append(Paragraph("For queries contact: info@quickfreight.com | Phone: +91-11-9876-5432", styles['Normal']))
     story.append(Spacer(1, 0.2*inch))
     story.append(Paragraph("This document is computer generated", 
-                          ParagraphStyle('Footer', parent=styles['Normal'], fontSize=8, textColor=colors.grey, alignment=TA_CENTER)))
+                          FOOTER_STYLE))
     
     # Build PDF
     doc.build(story)
@@ -244,6 +249,11 @@ def create_suspicious_invoice():
 
 if __name__ == "__main__":
     print("Generating sample PDF invoices...")
-    create_valid_invoice()
-    create_suspicious_invoice()
+    builders = [create_valid_invoice, create_suspicious_invoice]
+    
+    # Each PDF is an independent, CPU-bound ReportLab render
+    with ProcessPoolExecutor(max_workers=min(len(builders), os.cpu_count() or 1)) as executor:
+        futures = [executor.submit(build) for build in builders]
+        for future in as_completed(futures):
+            future.result()  # Re-raise any build error
     print("PDF generation complete!")
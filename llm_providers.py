@@ -4,14 +4,19 @@ Supports multiple LLM providers: Groq (default/free), Gemini, OpenAI
 """
 
 import os
-from typing import Optional, Literal
-from langchain_openai import ChatOpenAI
-from langchain_groq import ChatGroq
-from langchain_google_genai import ChatGoogleGenerativeAI
+import threading
+from typing import Any, List, Optional, Literal, Tuple
 import logging
 
+from config import LLM_TIMEOUT_CONFIG
+
 logger = logging.getLogger(__name__)
 
+# Client-side request timeout. Calls abandoned by the adaptive timeout keep
+# running on their worker thread until this ends them, so it matches the
+# adaptive timeout's upper bound.
+CLIENT_TIMEOUT_SECONDS = LLM_TIMEOUT_CONFIG["max_timeout"]
+
 ProviderType = Literal["groq", "gemini", "openai"]
 
 # Provider configurations
@@ -36,10 +41,21 @@ PROVIDER_CONFIGS = {
     }
 }
 
+# Clients are shared per (provider, temperature, model, api key) so every agent
+# reuses the same SDK client and its keep-alive connection pool
+_LLM_CACHE = {}
+_LLM_CACHE_LOCK = threading.Lock()
+
+
+def get_selected_provider() -> str:
+    """Preferred provider currently selected via LLM_PROVIDER (defaults to "groq")."""
+    return os.getenv("LLM_PROVIDER", "groq").lower()
+
 
 def get_llm(provider: Optional[str] = None, temperature: Optional[float] = None):
     """
     Get LLM instance based on provider selection.
+    Instances are cached, so repeated calls return the same client.
     
     Args:
         provider: LLM provider ("groq", "gemini", "openai"). 
@@ -61,26 +77,40 @@ def get_llm(provider: Optional[str] = None, temperature: Optional[float] = None)
     if provider not in PROVIDER_CONFIGS:
         raise ValueError(f"Invalid provider: {provider}. Must be one of: {list(PROVIDER_CONFIGS.keys())}")
     
-    # Initialize callback handler for forensic logging
-    from utils.observability import LoggingCallbackHandler
-    
     config = PROVIDER_CONFIGS[provider]
     temp = temperature if temperature is not None else config["temperature"]
     
+    cache_key = (provider, temp, config["model"], os.getenv(f"{provider.upper()}_API_KEY"))
+    with _LLM_CACHE_LOCK:
+        llm = _LLM_CACHE.get(cache_key)
+        if llm is None:
+            llm = _create_llm(provider, config, temp)
+            _LLM_CACHE[cache_key] = llm
+    return llm
+
+
+def _create_llm(provider: str, config: dict, temp: float):
+    """Construct a new client for a validated provider."""
+    # Initialize callback handler for forensic logging
+    from utils.observability import LoggingCallbackHandler
+    
     callbacks = [LoggingCallbackHandler(provider=provider, model=config["model"])]
     
     logger.info(f"Initializing LLM provider: {provider} (model: {config['model']})")
     
+    # Provider SDKs are imported on first use, so a run only loads the ones it needs
     try:
         if provider == "groq":
             api_key = os.getenv("GROQ_API_KEY")
             if not api_key:
                 raise ValueError("GROQ_API_KEY not found in environment")
             
+            from langchain_groq import ChatGroq
             return ChatGroq(
                 model=config["model"],
                 temperature=temp,
                 groq_api_key=api_key,
+                timeout=CLIENT_TIMEOUT_SECONDS,
                 callbacks=callbacks
             )
         
@@ -89,10 +119,12 @@ def get_llm(provider: Optional[str] = None, temperature: Optional[float] = None)
             if not api_key:
                 raise ValueError("GEMINI_API_KEY not found in environment")
             
+            from langchain_google_genai import ChatGoogleGenerativeAI
             return ChatGoogleGenerativeAI(
                 model=config["model"],
                 temperature=temp,
                 google_api_key=api_key,
+                timeout=CLIENT_TIMEOUT_SECONDS,
                 callbacks=callbacks
             )
         
@@ -101,10 +133,12 @@ def get_llm(provider: Optional[str] = None, temperature: Optional[float] = None)
             if not api_key:
                 raise ValueError("OPENAI_API_KEY not found in environment")
             
+            from langchain_openai import ChatOpenAI
             return ChatOpenAI(
                 model=config["model"],
                 temperature=temp,
                 api_key=api_key,
+                timeout=CLIENT_TIMEOUT_SECONDS,
                 callbacks=callbacks
             )
     
@@ -113,6 +147,21 @@ def get_llm(provider: Optional[str] = None, temperature: Optional[float] = None)
         raise
 
 
+def _fallback_chain(preferred_provider: Optional[str] = None) -> List[str]:
+    """Provider order for fallback: preferred → groq → gemini → openai."""
+    fallback_chain = []
+    
+    if preferred_provider:
+        fallback_chain.append(preferred_provider)
+    
+    # Add remaining providers in order
+    for p in ["groq", "gemini", "openai"]:
+        if p not in fallback_chain:
+            fallback_chain.append(p)
+    
+    return fallback_chain
+
+
 def get_llm_with_fallback(preferred_provider: Optional[str] = None, temperature: Optional[float] = None):
     """
     Get LLM with automatic fallback to other providers.
@@ -134,20 +183,9 @@ def get_llm_with_fallback(preferred_provider: Optional[str] = None, temperature:
         llm = get_llm(provider, temperature)
         return llm, provider
     
-    # Fallback chain: preferred → groq → gemini → openai
-    fallback_chain = []
-    
-    if preferred_provider:
-        fallback_chain.append(preferred_provider)
-    
-    # Add remaining providers in order
-    for p in ["groq", "gemini", "openai"]:
-        if p not in fallback_chain:
-            fallback_chain.append(p)
-    
     # Try each provider
     last_error = None
-    for provider in fallback_chain:
+    for provider in _fallback_chain(preferred_provider):
         try:
             llm = get_llm(provider, temperature)
             if provider != (preferred_provider or os.getenv("LLM_PROVIDER", "groq")):
@@ -162,6 +200,43 @@ def get_llm_with_fallback(preferred_provider: Optional[str] = None, temperature:
     raise RuntimeError(f"All LLM providers failed. Last error: {last_error}")
 
 
+def get_llm_chain(preferred_provider: Optional[str] = None, temperature: Optional[float] = None) -> List[Tuple[Any, str]]:
+    """
+    Get every usable LLM in fallback order, for per-call failover.
+    Unlike get_llm_with_fallback, providers that initialize are all returned,
+    so a caller can move on to the next one when a call times out or errors.
+    
+    Args:
+        preferred_provider: Preferred provider to try first
+        temperature: Temperature setting
+    
+    Returns:
+        List of (llm_instance, provider_name) tuples, preferred first
+    
+    Raises:
+        RuntimeError: If no provider could be initialized
+    """
+    enable_fallback = os.getenv("ENABLE_FALLBACK", "true").lower() == "true"
+    
+    if not enable_fallback:
+        provider = preferred_provider or os.getenv("LLM_PROVIDER", "groq")
+        return [(get_llm(provider, temperature), provider)]
+    
+    llms = []
+    last_error = None
+    for provider in _fallback_chain(preferred_provider or os.getenv("LLM_PROVIDER", "groq").lower()):
+        try:
+            llms.append((get_llm(provider, temperature), provider))
+        except Exception as e:
+            logger.warning(f"Provider {provider} unavailable: {e}")
+            last_error = e
+    
+    if not llms:
+        raise RuntimeError(f"All LLM providers failed. Last error: {last_error}")
+    
+    return llms
+
+
 def get_available_providers():
     """
     Get list of available providers based on API keys in environment.
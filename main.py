@@ -8,13 +8,16 @@ Usage:
 """
 
 import argparse
-import json
 import logging
+import uuid
 from pathlib import Path
 from datetime import datetime
+from typing import List
 
-from agents import create_audit_workflow, AuditState
-from evaluation import evaluate_audit_faithfulness
+import orjson
+
+from agents import create_audit_workflow, run_workflow_batch_sync, AuditState
+from evaluation import evaluate_audit_faithfulness, evaluate_audit_faithfulness_batch
 import config
 
 # Setup logging
@@ -47,93 +50,85 @@ def run_audit(pdf_path: str, output_dir: Path) -> dict:
         document_id=document_id
     )
     
-    # Create and run workflow
+    # Create and run workflow (the checkpointer needs a thread id)
     workflow = create_audit_workflow()
-    result = workflow.invoke(initial_state)
+    run_config = {"configurable": {"thread_id": str(uuid.uuid4())}}
+    result = workflow.invoke(initial_state, config=run_config)
     
-    # LangGraph returns a dict, convert back to AuditState
+    # LangGraph returns a dict of already validated channel values,
+    # so rebuild the AuditState without re-validating it
     if isinstance(result, dict):
-        final_state = AuditState(**result)
+        final_state = AuditState.model_construct(**result)
     else:
         final_state = result
     
-    # Build output JSON
-    output = {
-        "document_id": final_state.document_id,
-        "audit_date": final_state.audit_date.isoformat(),
-        "workflow_status": final_state.workflow_status,
-        "extraction": None,
-        "verification": None,
-        "compliance": None,
-        "errors": final_state.errors
-    }
-    
-    # Add extraction results
-    if final_state.extraction:
-        output["extraction"] = {
-            "co2e_claimed": final_state.extraction.co2e_claimed,
-            "supplier_id": final_state.extraction.supplier_id,
-            "route": final_state.extraction.route,
-            "transport_mode": final_state.extraction.transport_mode,
-            "weight_kg": final_state.extraction.weight_kg,
-            "distance_km": final_state.extraction.distance_km,
-            "extraction_confidence": final_state.extraction.extraction_confidence,
-            "errors": final_state.extraction.errors
-        }
-    
-    # Add verification results
-    if final_state.verification:
-        output["verification"] = {
-            "benchmark_co2e": final_state.verification.benchmark_co2e,
-            "deviation_percent": final_state.verification.deviation_percent,
-            "status": final_state.verification.status,
-            "discrepancies": final_state.verification.discrepancies,
-            "verification_confidence": final_state.verification.verification_confidence
-        }
-    
-    # Add compliance results
-    if final_state.compliance:
-        output["compliance"] = {
-            "trust_score": final_state.compliance.trust_score,
-            "brsr_aligned": final_state.compliance.brsr_aligned,
-            "category": final_state.compliance.category,
-            "recommendations": final_state.compliance.recommendations,
-            "compliance_details": final_state.compliance.compliance_details
-        }
-    
-    # Add reasoning history
-    output["reasoning_history"] = [
-        {
-            "agent": step.agent,
-            "timestamp": step.timestamp.isoformat(),
-            "action": step.action,
-            "reasoning": step.reasoning,
-            "result": step.result
-        }
-        for step in final_state.reasoning_history
-    ]
-    
-    # Add human review status
-    output["human_review"] = {
-        "required": final_state.requires_human_review,
-        "reason": final_state.human_review_reason,
-        "completed": final_state.human_review_completed,
-        "decision": final_state.human_review_decision
-    }
+    return save_audit_result(final_state, output_dir)
+
+
+def run_audit_batch(pdf_paths: List[Path], output_dir: Path, max_concurrency: int = 8) -> List[dict]:
+    """
+    Run ESG audits on several PDF invoices concurrently.
+    
+    Args:
+        pdf_paths: Paths to PDF invoices
+        output_dir: Directory for output files
+        max_concurrency: Maximum number of audits in flight at once
+        
+    Returns:
+        Audit results as dictionaries (documents that failed to save are skipped)
+    """
+    states = [AuditState(pdf_path=str(pdf_path), document_id=pdf_path.stem) for pdf_path in pdf_paths]
+    final_states = run_workflow_batch_sync(states, max_concurrency=max_concurrency)
+    
+    results = []
+    saved_states = []
+    for final_state in final_states:
+        try:
+            results.append(save_audit_result(final_state, output_dir, evaluate=False))
+            saved_states.append(final_state)
+        except Exception as e:
+            logger.error(f"Failed to process {final_state.pdf_path}: {e}")
+    
+    # Optional: Run RAGAS evaluation for the whole batch at once
+    try:
+        eval_scores = evaluate_audit_faithfulness_batch(saved_states)
+        for final_state, scores in zip(saved_states, eval_scores):
+            logger.info(f"Faithfulness score for {final_state.document_id}: {scores.get('faithfulness', 'N/A')}")
+    except Exception as e:
+        logger.warning(f"Evaluation skipped: {e}")
+    
+    return results
+
+
+def save_audit_result(final_state: AuditState, output_dir: Path, evaluate: bool = True) -> dict:
+    """
+    Write the audit JSON for a finished workflow and run the optional evaluation.
+    
+    Args:
+        final_state: Final audit state returned by the workflow
+        output_dir: Directory for output files
+        evaluate: Run the RAGAS evaluation for this audit (batches evaluate together)
+        
+    Returns:
+        Audit results as dictionary
+    """
+    document_id = final_state.document_id
+    
+    output = final_state.to_output_dict()
     
     # Save output
     output_file = output_dir / f"{document_id}_audit.json"
-    with open(output_file, "w", encoding="utf-8") as f:
-        json.dump(output, f, indent=2, ensure_ascii=False)
+    output_file.write_bytes(orjson.dumps(output, option=orjson.OPT_INDENT_2))
     
     logger.info(f"Audit complete. Results saved to: {output_file}")
     
     # Optional: Run RAGAS evaluation
-    try:
-        eval_scores = evaluate_audit_faithfulness(final_state)
-        logger.info(f"Faithfulness score: {eval_scores.get('faithfulness', 'N/A')}")
-    except Exception as e:
-        logger.warning(f"Evaluation skipped: {e}")
+    if evaluate:
+        try:
+            eval_scores = evaluate_audit_faithfulness(final_state)
+            logger.info(f"Faithfulness score: {eval_scores.get('faithfulness', 'N/A')}")
+        except Exception as e:
+            logger.warning(f"Evaluation skipped: {e}")
     
     return output
 
@@ -152,6 +147,12 @@ def main():
         action="store_true",
         help="Process all PDFs in input directory"
     )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=8,
+        help="Maximum audits in flight at once in batch mode (default: 8)"
+    )
     parser.add_argument(
         "--output",
         type=str,
@@ -173,22 +174,16 @@ def main():
         pdf_files = list(input_path.glob("*.pdf"))
         logger.info(f"Found {len(pdf_files)} PDF files for batch processing")
         
-        results = []
-        for pdf_file in pdf_files:
-            try:
-                result = run_audit(str(pdf_file), output_dir)
-                results.append(result)
-            except Exception as e:
-                logger.error(f"Failed to process {pdf_file}: {e}")
+        # Independent audits run concurrently (LLM and PDF work overlap)
+        results = run_audit_batch(pdf_files, output_dir, max_concurrency=args.max_concurrency)
         
         # Save batch summary
         summary_file = output_dir / f"batch_summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(summary_file, "w", encoding="utf-8") as f:
-            json.dump({
-                "total_processed": len(results),
-                "timestamp": datetime.now().isoformat(),
-                "results": results
-            }, f, indent=2)
+        summary_file.write_bytes(orjson.dumps({
+            "total_processed": len(results),
+            "timestamp": datetime.now().isoformat(),
+            "results": results
+        }, option=orjson.OPT_INDENT_2))
         
         logger.info(f"Batch processing complete. Summary: {summary_file}")
         
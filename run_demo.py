@@ -7,7 +7,7 @@ from agents.state import AuditState, ExtractionResult, VerificationResult, Compl
 from agents.workflow import create_audit_workflow
 from knowledge_base.logistics_api import logistics_api
 from datetime import datetime
-import json
+import orjson
 from pathlib import Path
 
 def run_demo_audit(pdf_path: str, is_suspicious: bool = False):
@@ -196,7 +196,7 @@ def run_demo_audit(pdf_path: str, is_suspicious: bool = False):
     
     print(f"\nReasoning Steps ({len(state.reasoning_history)} total):")
     for i, step in enumerate(state.reasoning_history[-5:], 1):
-        print(f"  {i}. [{step.agent}] {step.action}: {step.reasoning[:60]}...")
+        print(f"  {i}. [{step.agent}] {step.action}: {step.render_reasoning()[:60]}...")
     
     print(f"{'='*60}\n")
     
@@ -204,51 +204,10 @@ def run_demo_audit(pdf_path: str, is_suspicious: bool = False):
     output_dir = Path("output")
     output_dir.mkdir(exist_ok=True)
     
-    output = {
-        "document_id": state.document_id,
-        "audit_date": state.audit_date.isoformat(),
-        "workflow_status": state.workflow_status,
-        "extraction": {
-            "co2e_claimed": state.extraction.co2e_claimed,
-            "supplier_id": state.extraction.supplier_id,
-            "route": state.extraction.route,
-            "transport_mode": state.extraction.transport_mode,
-            "weight_kg": state.extraction.weight_kg,
-            "distance_km": state.extraction.distance_km,
-            "extraction_confidence": state.extraction.extraction_confidence
-        },
-        "verification": {
-            "benchmark_co2e": state.verification.benchmark_co2e,
-            "deviation_percent": state.verification.deviation_percent,
-            "status": state.verification.status,
-            "discrepancies": state.verification.discrepancies
-        },
-        "compliance": {
-            "trust_score": state.compliance.trust_score,
-            "brsr_aligned": state.compliance.brsr_aligned,
-            "recommendations": state.compliance.recommendations
-        },
-        "reasoning_history": [
-            {
-                "agent": step.agent,
-                "timestamp": step.timestamp.isoformat(),
-                "action": step.action,
-                "reasoning": step.reasoning,
-                "result": step.result
-            }
-            for step in state.reasoning_history
-        ],
-        "human_review": {
-            "required": state.requires_human_review,
-            "reason": state.human_review_reason,
-            "completed": state.human_review_completed,
-            "decision": state.human_review_decision
-        }
-    }
+    output = state.to_output_dict()
     
     output_file = output_dir / f"{state.document_id}_audit.json"
-    with open(output_file, "w", encoding="utf-8") as f:
-        json.dump(output, f, indent=2)
+    output_file.write_bytes(orjson.dumps(output, option=orjson.OPT_INDENT_2))
     
     print(f"✓ Results saved to: {output_file}\n")
     
@@ -0,0 +1,8 @@
+"""
+Shared pytest setup: make the flat project modules importable from tests/.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -0,0 +1,121 @@
+"""
+Tests for adaptive LLM timeouts and provider failover in extraction.
+"""
+
+import sys
+import threading
+
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.prompt_values import StringPromptValue
+from langchain_core.runnables import RunnableLambda
+
+import config
+import utils.adaptive_timeout as adaptive_timeout
+from agents.state import AuditState, ExtractionResult
+from utils.adaptive_timeout import CallPoolSaturatedError, LatencyTracker
+from utils.circuit_breaker import CircuitBreaker
+
+# agents/__init__ re-exports the extraction_agent function under the module's name
+extraction_module = sys.modules["agents.extraction_agent"]
+
+
+@pytest.fixture
+def release():
+    """Event that unblocks hung fake calls at teardown, so no worker is left waiting."""
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+@pytest.fixture
+def short_timeouts(monkeypatch):
+    """Give every provider a fresh tracker with a short initial timeout; disable the response cache."""
+    trackers = {}
+    monkeypatch.setattr(
+        extraction_module, "get_tracker",
+        lambda name: trackers.setdefault(name, LatencyTracker(name, initial_timeout=0.1, min_timeout=0.1))
+    )
+    monkeypatch.setattr(config, "ENABLE_LLM_CACHE", False)
+    return trackers
+
+
+def _hung_llm(release):
+    """LLM stand-in that blocks until the test releases it."""
+    return RunnableLambda(lambda _: release.wait(5))
+
+
+def _message(content: str):
+    return RunnableLambda(lambda _: AIMessage(content=content))
+
+
+def test_timeout_uses_initial_value_until_enough_samples():
+    tracker = LatencyTracker("test", initial_timeout=30, min_samples=5)
+    for _ in range(4):
+        tracker.record(1.0)
+
+    assert tracker.timeout() == 30
+
+
+def test_timeout_is_p95_times_multiplier_clamped():
+    tracker = LatencyTracker("test", min_timeout=5, max_timeout=60, p95_multiplier=2, min_samples=5)
+    for seconds in [1.0] * 19 + [10.0]:
+        tracker.record(seconds)
+    assert tracker.timeout() == 5  # p95 of 1s * 2, raised to min_timeout
+
+    for seconds in [20.0] * 20:
+        tracker.record(seconds)
+    assert tracker.timeout() == 40
+
+    for seconds in [100.0] * 20:
+        tracker.record(seconds)
+    assert tracker.timeout() == 60
+
+
+def test_call_raises_timeout_and_records_only_successes(release):
+    tracker = LatencyTracker("test", initial_timeout=0.05)
+
+    assert tracker.call(lambda: "ok") == "ok"
+    with pytest.raises(TimeoutError, match="adaptive timeout"):
+        tracker.call(release.wait, 5)
+
+    assert len(tracker.latencies) == 1
+
+
+def test_call_rejected_when_all_workers_busy(monkeypatch):
+    busy = threading.BoundedSemaphore(1)
+    busy.acquire()
+    monkeypatch.setattr(adaptive_timeout, "_in_flight", busy)
+    calls = []
+
+    with pytest.raises(CallPoolSaturatedError, match="workers are busy"):
+        LatencyTracker("test").call(calls.append, 1)
+    assert not calls
+
+
+def test_saturated_pool_does_not_trip_the_breaker(monkeypatch):
+    busy = threading.BoundedSemaphore(1)
+    busy.acquire()
+    monkeypatch.setattr(adaptive_timeout, "_in_flight", busy)
+    breaker = CircuitBreaker("test", failure_threshold=1)
+
+    for _ in range(3):
+        with pytest.raises(CallPoolSaturatedError):
+            breaker.call(LatencyTracker("test").call, lambda: "ok")
+
+    assert breaker.failures == 0 and breaker.allow()
+
+
+def test_extraction_fails_over_after_timeout(short_timeouts, release, monkeypatch):
+    result = ExtractionResult(co2e_claimed=145.5, extraction_confidence=0.9)
+    monkeypatch.setattr(extraction_module, "_get_llms", lambda: [
+        (_hung_llm(release), "timeout-test-slow"),
+        (_message(result.model_dump_json()), "timeout-test-fast"),
+    ])
+    state = AuditState(pdf_path="invoice.pdf", document_id="invoice")
+
+    extraction = extraction_module._invoke_llm_extraction(state, StringPromptValue(text="invoice"))
+
+    assert extraction.co2e_claimed == 145.5
+    assert [step.action for step in state.reasoning_history] == ["llm_failover"]
+    assert "timeout-test-slow" in state.reasoning_history[0].reasoning
@@ -0,0 +1,69 @@
+"""
+Tests for the extractive BRSR standards compression and its on-disk cache.
+"""
+
+import pytest
+
+import agents.brsr_compress as brsr_compress
+from agents.brsr_compress import compress_standards, load_compressed_standards
+
+STANDARDS = """# BRSR Standards
+
+## Overview
+
+General introduction to the framework.
+
+## Principle 6
+
+Companies must   disclose Scope 3 emissions.
+**Mandatory** reporting applies to listed entities.
+Unrelated filler sentence.
+
+### Empty Section
+
+## Annexure
+
+Nothing to see here.
+"""
+
+
+@pytest.fixture
+def standards_paths(tmp_path, monkeypatch):
+    """Point the module at a temporary standards file and compressed cache."""
+    source = tmp_path / "standards.md"
+    source.write_text(STANDARDS, encoding="utf-8")
+    compressed = tmp_path / "standards.compressed.md"
+    monkeypatch.setattr(brsr_compress, "BRSR_STANDARDS_PATH", source)
+    monkeypatch.setattr(brsr_compress, "BRSR_COMPRESSED_PATH", compressed)
+    return source, compressed
+
+
+def test_keeps_relevant_lines_and_drops_empty_headings():
+    assert compress_standards(STANDARDS).splitlines() == [
+        "# BRSR Standards",
+        "## Principle 6",
+        "Companies must disclose Scope 3 emissions.",
+        "Mandatory reporting applies to listed entities.",
+    ]
+
+
+def test_compressed_file_is_written_and_reused(standards_paths, monkeypatch):
+    _, compressed = standards_paths
+
+    first = load_compressed_standards()
+    assert compressed.read_text(encoding="utf-8").startswith(brsr_compress.SOURCE_HASH_PREFIX)
+
+    def fail(_):
+        raise AssertionError("compressed file should have been reused")
+
+    monkeypatch.setattr(brsr_compress, "compress_standards", fail)
+    assert load_compressed_standards() == first
+
+
+def test_compressed_file_is_rebuilt_when_source_changes(standards_paths):
+    source, _ = standards_paths
+    load_compressed_standards()
+
+    source.write_text("# Updated\n\nNew GHG methodology note.\n", encoding="utf-8")
+
+    assert load_compressed_standards() == "# Updated\nNew GHG methodology note."
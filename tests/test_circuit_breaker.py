@@ -0,0 +1,118 @@
+"""
+Tests for the per-provider circuit breaker: opening, the single half-open probe and cooldown backoff.
+"""
+
+import pytest
+
+import utils.circuit_breaker as circuit_breaker
+from utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+
+class FakeClock:
+    """Controllable stand-in for time.monotonic."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", clock)
+    return clock
+
+
+def _fail():
+    raise ConnectionError("provider down")
+
+
+def _trip(breaker: CircuitBreaker):
+    """Fail enough calls to open the circuit."""
+    for _ in range(breaker.failure_threshold):
+        with pytest.raises(ConnectionError):
+            breaker.call(_fail)
+
+
+def test_opens_after_threshold_and_rejects_calls(clock):
+    breaker = CircuitBreaker("test", failure_threshold=3, cooldown_seconds=30)
+    calls = []
+
+    _trip(breaker)
+
+    with pytest.raises(CircuitOpenError):
+        breaker.call(calls.append, 1)
+    assert not calls
+
+
+def test_success_below_threshold_resets_failure_count(clock):
+    breaker = CircuitBreaker("test", failure_threshold=3)
+
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            breaker.call(_fail)
+    assert breaker.call(lambda: "ok") == "ok"
+    with pytest.raises(ConnectionError):
+        breaker.call(_fail)
+
+    assert breaker.allow()
+
+
+def test_half_open_after_cooldown_and_closes_on_success(clock):
+    breaker = CircuitBreaker("test", failure_threshold=2, cooldown_seconds=30)
+    _trip(breaker)
+
+    clock.now += 29
+    assert not breaker.allow()
+    clock.now += 1
+    assert breaker.call(lambda: "ok") == "ok"
+
+    assert breaker.opened_at is None
+    assert breaker.failures == 0 and breaker.trips == 0
+
+
+def test_failed_half_open_probe_reopens_with_doubled_cooldown(clock):
+    breaker = CircuitBreaker("test", failure_threshold=2, cooldown_seconds=30, max_cooldown_seconds=50)
+    _trip(breaker)
+
+    clock.now += 30
+    with pytest.raises(ConnectionError):
+        breaker.call(_fail)
+
+    assert breaker.current_cooldown == 50  # 60s doubled cooldown, capped
+    clock.now += 49
+    assert not breaker.allow()
+    clock.now += 1
+    assert breaker.allow()
+
+
+def test_half_open_lets_a_single_probe_through(clock):
+    breaker = CircuitBreaker("test", failure_threshold=2, cooldown_seconds=30)
+    _trip(breaker)
+    clock.now += 30
+    rejected = []
+
+    def probe():
+        # A second caller arriving while the probe is in flight fails fast
+        with pytest.raises(CircuitOpenError):
+            breaker.call(rejected.append, 1)
+        assert not breaker.allow()
+        return "ok"
+
+    assert breaker.call(probe) == "ok"
+    assert not rejected
+    assert breaker.allow() and not breaker.probing
+
+
+def test_failed_probe_frees_the_probe_slot_for_the_next_cooldown(clock):
+    breaker = CircuitBreaker("test", failure_threshold=2, cooldown_seconds=30, max_cooldown_seconds=30)
+    _trip(breaker)
+    clock.now += 30
+    with pytest.raises(ConnectionError):
+        breaker.call(_fail)
+
+    assert not breaker.probing
+    clock.now += 30
+    assert breaker.call(lambda: "ok") == "ok"
@@ -0,0 +1,148 @@
+"""
+Tests for the LLM response cache and its use by the extraction agent.
+"""
+
+import sqlite3
+import sys
+
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.prompt_values import StringPromptValue
+from langchain_core.runnables import RunnableLambda
+
+import config
+from agents.state import AuditState, ExtractionResult
+import utils.llm_cache as llm_cache
+from utils.llm_cache import LLMResponseCache
+
+# agents/__init__ re-exports the extraction_agent function under the module's name
+extraction_module = sys.modules["agents.extraction_agent"]
+
+
+@pytest.fixture
+def response_cache(tmp_path, monkeypatch):
+    """Fresh on-disk cache, installed as the shared cache with caching enabled."""
+    response_cache = LLMResponseCache(str(tmp_path / "llm_cache.db"))
+    monkeypatch.setattr(extraction_module, "get_llm_cache", lambda: response_cache)
+    monkeypatch.setattr(config, "ENABLE_LLM_CACHE", True)
+    return response_cache
+
+
+def _fake_llm(calls, content):
+    """LLM stand-in that counts invocations and returns a fixed message."""
+    def invoke(_):
+        calls.append(1)
+        return AIMessage(content=content)
+    return RunnableLambda(invoke)
+
+
+def test_get_misses_then_hits_after_put(tmp_path):
+    response_cache = LLMResponseCache(str(tmp_path / "llm_cache.db"))
+    key = LLMResponseCache.make_key("extraction:groq", "prompt")
+
+    assert response_cache.get(key) is None
+    response_cache.put(key, "response")
+    assert response_cache.get(key) == "response"
+
+
+def test_entries_persist_across_connections(tmp_path):
+    db_path = str(tmp_path / "llm_cache.db")
+    key = LLMResponseCache.make_key("extraction:groq", "prompt")
+    LLMResponseCache(db_path).put(key, "response")
+
+    assert LLMResponseCache(db_path).get(key) == "response"
+
+
+def test_key_depends_on_namespace_and_prompt():
+    key = LLMResponseCache.make_key("extraction:groq", "prompt")
+
+    assert key == LLMResponseCache.make_key("extraction:groq", "prompt")
+    assert key != LLMResponseCache.make_key("extraction:gemini", "prompt")
+    assert key != LLMResponseCache.make_key("extraction:groq", "other prompt")
+
+
+def test_key_depends_on_model_and_temperature():
+    key = LLMResponseCache.make_key("extraction:groq", "prompt", "llama-3.3-70b-versatile", 0.0)
+
+    assert key != LLMResponseCache.make_key("extraction:groq", "prompt", "llama-3.1-8b-instant", 0.0)
+    assert key != LLMResponseCache.make_key("extraction:groq", "prompt", "llama-3.3-70b-versatile", 0.7)
+
+
+def test_key_depends_on_schema_version(monkeypatch):
+    key = LLMResponseCache.make_key("extraction:groq", "prompt")
+    monkeypatch.setattr(llm_cache, "CACHE_SCHEMA_VERSION", llm_cache.CACHE_SCHEMA_VERSION + 1)
+
+    assert key != LLMResponseCache.make_key("extraction:groq", "prompt")
+
+
+def test_expired_entries_miss_and_are_pruned(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "llm_cache.db")
+    now = [1_000_000.0]
+    monkeypatch.setattr(llm_cache.time, "time", lambda: now[0])
+    response_cache = LLMResponseCache(db_path, ttl_seconds=60)
+    response_cache.put("key", "response")
+
+    now[0] += 61
+    assert response_cache.get("key") is None
+
+    LLMResponseCache(db_path, ttl_seconds=60)
+    assert response_cache._conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0] == 0
+
+
+def test_oldest_entries_beyond_max_rows_are_pruned(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "llm_cache.db")
+    now = [1_000_000.0]
+    monkeypatch.setattr(llm_cache.time, "time", lambda: now[0])
+    response_cache = LLMResponseCache(db_path)
+    for i in range(5):
+        now[0] += 1
+        response_cache.put(f"key{i}", f"response{i}")
+
+    pruned = LLMResponseCache(db_path, max_rows=2)
+
+    assert [pruned.get(f"key{i}") for i in range(5)] == [None, None, None, "response3", "response4"]
+
+
+def test_table_from_before_ttl_support_is_replaced(tmp_path):
+    db_path = str(tmp_path / "llm_cache.db")
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE llm_responses (key TEXT PRIMARY KEY, response TEXT NOT NULL)")
+    conn.execute("INSERT INTO llm_responses VALUES ('key', 'stale')")
+    conn.commit()
+    conn.close()
+
+    response_cache = LLMResponseCache(db_path)
+    assert response_cache.get("key") is None
+    response_cache.put("key", "response")
+    assert response_cache.get("key") == "response"
+
+
+def test_extraction_stores_on_miss_and_skips_llm_on_hit(response_cache, monkeypatch):
+    calls = []
+    result = ExtractionResult(co2e_claimed=145.5, supplier_id="SUP-1", extraction_confidence=0.9)
+    monkeypatch.setattr(extraction_module, "_get_llms", lambda: [(_fake_llm(calls, result.model_dump_json()), "groq")])
+    prompt = StringPromptValue(text="Invoice text: 145.5 kg CO2e")
+
+    first_state = AuditState(pdf_path="invoice.pdf", document_id="invoice")
+    first = extraction_module._invoke_llm_extraction(first_state, prompt)
+    second_state = AuditState(pdf_path="invoice.pdf", document_id="invoice")
+    second = extraction_module._invoke_llm_extraction(second_state, prompt)
+
+    assert len(calls) == 1
+    assert first.co2e_claimed == second.co2e_claimed == 145.5
+    assert [step.action for step in second_state.reasoning_history] == ["llm_cache_hit"]
+    assert not first_state.reasoning_history
+
+
+def test_extraction_bypasses_cache_when_disabled(response_cache, monkeypatch):
+    calls = []
+    result = ExtractionResult(co2e_claimed=145.5, extraction_confidence=0.9)
+    monkeypatch.setattr(extraction_module, "_get_llms", lambda: [(_fake_llm(calls, result.model_dump_json()), "groq")])
+    monkeypatch.setattr(config, "ENABLE_LLM_CACHE", False)
+    prompt = StringPromptValue(text="Invoice text: 145.5 kg CO2e")
+
+    for _ in range(2):
+        extraction_module._invoke_llm_extraction(AuditState(pdf_path="invoice.pdf", document_id="invoice"), prompt)
+
+    assert len(calls) == 2
+    assert response_cache.get(LLMResponseCache.make_key("extraction:groq", prompt.to_string())) is None
@@ -0,0 +1,38 @@
+"""
+Tests that the agents' cached LLM lookups follow the selected provider.
+"""
+
+import sys
+
+import agents  # noqa: F401
+
+# agents/__init__ re-exports the agent functions under their modules' names
+extraction_module = sys.modules["agents.extraction_agent"]
+compliance_module = sys.modules["agents.compliance_agent"]
+
+
+def test_extraction_chain_follows_llm_provider(monkeypatch):
+    built = []
+    monkeypatch.setattr(extraction_module, "get_llm_chain", lambda provider: built.append(provider) or [(provider, provider)])
+    extraction_module._get_llms_for.cache_clear()
+
+    monkeypatch.setenv("LLM_PROVIDER", "groq")
+    assert extraction_module._get_llms() == [("groq", "groq")]
+    monkeypatch.setenv("LLM_PROVIDER", "Gemini")
+    assert extraction_module._get_llms() == [("gemini", "gemini")]
+    monkeypatch.setenv("LLM_PROVIDER", "groq")
+    extraction_module._get_llms()
+
+    assert built == ["groq", "gemini"]
+    extraction_module._get_llms_for.cache_clear()
+
+
+def test_compliance_llm_follows_llm_provider(monkeypatch):
+    monkeypatch.setattr(compliance_module, "get_llm_with_fallback", lambda provider: (f"{provider}-llm", provider))
+    compliance_module._get_llm_for.cache_clear()
+
+    monkeypatch.setenv("LLM_PROVIDER", "groq")
+    assert compliance_module._get_llm() == ("groq-llm", "groq")
+    monkeypatch.setenv("LLM_PROVIDER", "openai")
+    assert compliance_module._get_llm() == ("openai-llm", "openai")
+    compliance_module._get_llm_for.cache_clear()
@@ -0,0 +1,136 @@
+"""
+Tests for the regex extractor's parsing and validation checks, and the LLM short-circuit they gate.
+"""
+
+import hashlib
+import sys
+from pathlib import Path
+
+import fitz
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+
+import config
+from agents.compliance_agent import calculate_base_trust_score
+import agents.regex_extractor as regex_extractor
+from agents.regex_extractor import extract_with_regex, is_validated
+from agents.state import AuditState, ExtractionResult, VerificationResult
+
+# agents/__init__ re-exports the extraction_agent function under the module's name
+extraction_module = sys.modules["agents.extraction_agent"]
+
+SAMPLES_DIR = Path(__file__).parent.parent / "data_samples"
+
+FULL_INVOICE = """Supplier ID: SUP-IN-2024-001
+Route: Mumbai to Delhi
+Transport: Road (truck)
+Weight: 2,500 kg
+Distance: 1450 km
+Emissions: 145.5 kg CO2e
+"""
+
+
+def _sample_text(name: str) -> str:
+    with fitz.open(SAMPLES_DIR / name) as doc:
+        return "".join(page.get_text("text") for page in doc)
+
+
+@pytest.mark.parametrize("text", ["nothing useful here", "Truck shipment, 120 kg CO2e", FULL_INVOICE])
+def test_regex_confidence_is_fixed(text):
+    assert extract_with_regex(text)["extraction_confidence"] == 0.6
+
+
+def test_complete_consistent_extraction_is_validated():
+    result = extract_with_regex(FULL_INVOICE)
+
+    assert result["route"] == "Mumbai-Delhi"
+    assert result["weight_kg"] == 2500.0
+    assert is_validated(result)
+    assert not is_validated(extract_with_regex("Truck shipment, 120 kg CO2e"))
+
+
+@pytest.mark.parametrize("text, issue", [
+    (FULL_INVOICE.replace("Road (truck)", "Road (truck) then air freight"), "several transport modes"),
+    (FULL_INVOICE.replace("2,500 kg", "145.5 kg"), "weight matches the CO2e figure"),
+    (FULL_INVOICE.replace("2,500 kg", "2500"), "weight unit not stated"),
+    (FULL_INVOICE + "Net emissions: 0.0 kg CO2e\n", "several different CO2e figures"),
+    (FULL_INVOICE.replace("Mumbai to Delhi", "Mumbai Central Freight Corridor Terminal to Delhi"), "route text"),
+])
+def test_failed_checks_block_the_short_circuit(text, issue):
+    result = extract_with_regex(text)
+
+    assert any(issue in found for found in result["validation_issues"])
+    assert not is_validated(result)
+
+
+def test_units_and_thousands_separators_are_parsed():
+    eur = extract_with_regex(_sample_text("edge_case_eur_currency.pdf"))
+    assert eur["weight_kg"] == 12500.0  # 12.5 metric tons, not the 202.8 kg CO2e figure
+    assert eur["distance_km"] == pytest.approx(6850 * 1.852)  # nautical miles
+    assert eur["co2e_claimed"] == 202.8
+    assert eur["route"] == "Hamburg Port-Mumbai Port"
+
+    multimodal = extract_with_regex(_sample_text("edge_case_multimodal.pdf"))
+    assert multimodal["co2e_claimed"] == 2100.5
+    assert not is_validated(multimodal)
+
+
+def test_routes_stay_within_their_fields():
+    result = extract_with_regex(_sample_text("edge_case_high_risk_region.pdf"))
+
+    assert result["route"] == "Kabul Distribution Center-Islamabad Warehouse"
+
+
+def test_demo_and_fallback_keep_the_fixed_confidence():
+    state = AuditState(pdf_path="invoice.pdf", document_id="invoice")
+    extraction_module._apply_regex_extraction(state, FULL_INVOICE, "Regex extraction with {confidence:.2f} confidence")
+    state.verification = VerificationResult(status="acceptable", verification_confidence=1.0)
+
+    assert state.extraction.extraction_confidence == 0.6
+    # Completeness (30) + verification (40 x confidence) + disclosure (15 + 15 x extraction confidence)
+    assert calculate_base_trust_score(state) == pytest.approx(30.0 + 40.0 + 15.0 + 0.6 * 15.0)
+
+
+@pytest.fixture
+def counted_llm(monkeypatch):
+    """Install a single fake provider and count its calls; disable the response cache."""
+    calls = []
+    content = ExtractionResult(co2e_claimed=2100.5, transport_mode="air", extraction_confidence=0.95).model_dump_json()
+
+    def invoke(_):
+        calls.append(1)
+        return AIMessage(content=content)
+
+    monkeypatch.setattr(extraction_module, "_get_llms", lambda: [(RunnableLambda(invoke), "regex-test")])
+    monkeypatch.setattr(extraction_module, "_is_demo_mode", lambda: False)
+    monkeypatch.setattr(config, "ENABLE_LLM_CACHE", False)
+    return calls
+
+
+def test_validated_invoice_skips_the_llm(counted_llm):
+    state = extraction_module.extraction_agent(
+        AuditState(pdf_path=str(SAMPLES_DIR / "valid_invoice.pdf"), document_id="valid")
+    )
+
+    assert not counted_llm
+    assert "regex_short_circuit" in [step.action for step in state.reasoning_history]
+    assert state.extraction.extraction_confidence == config.EXTRACTION_CONFIG["regex_validated_confidence"]
+
+
+def test_unvalidated_invoice_goes_to_the_llm(counted_llm):
+    state = extraction_module.extraction_agent(
+        AuditState(pdf_path=str(SAMPLES_DIR / "edge_case_multimodal.pdf"), document_id="multimodal")
+    )
+
+    assert len(counted_llm) == 1
+    assert state.extraction.transport_mode == "air"
+
+
+def test_memoized_results_are_copies_keyed_by_digest():
+    first = extract_with_regex(FULL_INVOICE)
+    first["co2e_claimed"] = None
+
+    assert extract_with_regex(FULL_INVOICE)["co2e_claimed"] == 145.5
+    assert hashlib.sha256(FULL_INVOICE.encode("utf-8")).hexdigest() in regex_extractor._result_cache
+    assert FULL_INVOICE not in regex_extractor._result_cache
@@ -0,0 +1,57 @@
+"""
+Tests for the compressed extracted_text storage on ExtractionResult.
+"""
+
+import json
+
+from agents.state import AuditState, ExtractionResult
+
+INVOICE_TEXT = "Supplier ID: SUP-IN-2024-001\nEmissions: 145.5 kg CO2e\n" * 20
+
+
+def test_text_is_stored_compressed_and_read_back():
+    extraction = ExtractionResult(extracted_text=INVOICE_TEXT)
+
+    assert extraction.extracted_text_blob is not None
+    assert len(extraction.extracted_text_blob) < len(INVOICE_TEXT)
+    assert extraction.extracted_text == INVOICE_TEXT
+
+
+def test_setter_recompresses_and_empty_text_clears_blob():
+    extraction = ExtractionResult()
+    assert extraction.extracted_text == ""
+
+    extraction.extracted_text = INVOICE_TEXT
+    assert extraction.extracted_text == INVOICE_TEXT
+
+    extraction.extracted_text = ""
+    assert extraction.extracted_text_blob is None
+
+
+def test_dumps_plain_text_and_round_trips():
+    extraction = ExtractionResult(co2e_claimed=145.5, extracted_text=INVOICE_TEXT)
+
+    dumped = extraction.model_dump()
+    assert "extracted_text_blob" not in dumped
+    assert dumped["extracted_text"] == INVOICE_TEXT
+    assert ExtractionResult(**dumped) == extraction
+
+    dumped_json = extraction.model_dump_json()
+    assert json.loads(dumped_json)["extracted_text"] == INVOICE_TEXT
+    assert ExtractionResult.model_validate_json(dumped_json) == extraction
+
+
+def test_dump_honours_include_and_exclude():
+    extraction = ExtractionResult(co2e_claimed=145.5, extracted_text=INVOICE_TEXT)
+
+    assert extraction.model_dump(include={"co2e_claimed"}) == {"co2e_claimed": 145.5}
+    assert "extracted_text" not in extraction.model_dump(exclude={"extracted_text"})
+
+
+def test_nested_in_audit_state_round_trips():
+    state = AuditState(pdf_path="invoice.pdf", document_id="invoice")
+    state.extraction = ExtractionResult(extracted_text=INVOICE_TEXT)
+
+    restored = AuditState.model_validate_json(state.model_dump_json())
+
+    assert restored.extraction.extracted_text == INVOICE_TEXT
@@ -0,0 +1,53 @@
+"""
+Tests for the concurrent batch workflow runner.
+"""
+
+import asyncio
+
+import agents.workflow as workflow_module
+from agents.state import AuditState
+
+
+class FakeApp:
+    """Compiled-workflow stand-in that records concurrency and fails chosen documents."""
+
+    def __init__(self, fail_ids=()):
+        self.fail_ids = set(fail_ids)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.thread_ids = []
+
+    async def ainvoke(self, state, config):
+        self.thread_ids.append(config["configurable"]["thread_id"])
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        if state.document_id in self.fail_ids:
+            raise ValueError("extraction exploded")
+        return {**dict(state), "workflow_status": "complete"}
+
+
+def _states(count):
+    return [AuditState(pdf_path=f"invoice{i}.pdf", document_id=f"invoice{i}") for i in range(count)]
+
+
+def test_batch_keeps_order_and_isolates_failures(monkeypatch):
+    app = FakeApp(fail_ids={"invoice1"})
+    monkeypatch.setattr(workflow_module, "create_audit_workflow", lambda persist=True: app)
+
+    results = workflow_module.run_workflow_batch_sync(_states(3))
+
+    assert [state.document_id for state in results] == ["invoice0", "invoice1", "invoice2"]
+    assert [state.workflow_status for state in results] == ["complete", "workflow_failed", "complete"]
+    assert results[1].errors == ["Workflow error: extraction exploded"]
+    assert len(set(app.thread_ids)) == 3
+
+
+def test_batch_respects_max_concurrency(monkeypatch):
+    app = FakeApp()
+    monkeypatch.setattr(workflow_module, "create_audit_workflow", lambda persist=True: app)
+
+    workflow_module.run_workflow_batch_sync(_states(6), max_concurrency=2)
+
+    assert app.max_in_flight == 2
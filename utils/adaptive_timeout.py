@@ -0,0 +1,114 @@
+"""
+Adaptive per-provider LLM call timeouts.
+Tracks recent successful call latencies and derives a timeout from their p95,
+so a hung provider is abandoned quickly instead of after the client default.
+
+Python threads cannot be cancelled, so an abandoned call keeps running (and
+consuming tokens) until the client's own request timeout ends it. The clients
+are built with that timeout set to LLM_TIMEOUT_CONFIG["max_timeout"] (see
+llm_providers), and the in-flight semaphore caps how many can pile up.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+import config
+from utils.circuit_breaker import LocalCallError
+
+logger = logging.getLogger(__name__)
+
+# Calls run on worker threads so the caller can stop waiting on timeout;
+# an abandoned call finishes in the background under the client's own timeout.
+# The semaphore counts in-flight calls (abandoned ones included), so a pool
+# clogged by hung calls rejects new work instead of queueing it behind them.
+_executor = ThreadPoolExecutor(max_workers=config.LLM_CALL_MAX_WORKERS, thread_name_prefix="llm-call")
+_in_flight = threading.BoundedSemaphore(config.LLM_CALL_MAX_WORKERS)
+
+
+class CallPoolSaturatedError(LocalCallError):
+    """Raised when every LLM call worker is busy; says nothing about the provider's health."""
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies for one provider."""
+
+    def __init__(
+        self,
+        name: str,
+        initial_timeout: float = 30.0,
+        min_timeout: float = 5.0,
+        max_timeout: float = 60.0,
+        p95_multiplier: float = 2.0,
+        window: int = 100,
+        min_samples: int = 5
+    ):
+        self.name = name
+        self.initial_timeout = initial_timeout
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.p95_multiplier = p95_multiplier
+        self.min_samples = min_samples
+        self.latencies: deque = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        """Record the latency of a successful call."""
+        with self._lock:
+            self.latencies.append(seconds)
+
+    def timeout(self) -> float:
+        """Current timeout: p95 latency * multiplier, clamped to [min, max]."""
+        with self._lock:
+            if len(self.latencies) < self.min_samples:
+                return self.initial_timeout
+            ordered = sorted(self.latencies)
+        p95 = ordered[int(0.95 * (len(ordered) - 1))]
+        return min(max(p95 * self.p95_multiplier, self.min_timeout), self.max_timeout)
+
+    def call(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Run fn with the adaptive timeout, recording its latency on success.
+
+        Raises:
+            TimeoutError: If fn does not complete within the current timeout
+                (the call is abandoned but keeps its worker until it ends)
+            CallPoolSaturatedError: If every call worker is still busy with earlier calls
+        """
+        if not _in_flight.acquire(blocking=False):
+            raise CallPoolSaturatedError(
+                f"{self.name} call rejected: all {config.LLM_CALL_MAX_WORKERS} LLM call workers are busy"
+            )
+        timeout = self.timeout()
+        start = time.monotonic()
+        try:
+            future = _executor.submit(fn, *args, **kwargs)
+        except BaseException:
+            _in_flight.release()
+            raise
+        future.add_done_callback(lambda _: _in_flight.release())
+        try:
+            result = future.result(timeout=timeout)
+        except TimeoutError:
+            future.cancel()
+            logger.warning("Abandoning %s call after %.1fs; it runs on until the client timeout", self.name, timeout)
+            raise TimeoutError(f"{self.name} call exceeded adaptive timeout of {timeout:.1f}s")
+        self.record(time.monotonic() - start)
+        return result
+
+
+_trackers: Dict[str, LatencyTracker] = {}
+_trackers_lock = threading.Lock()
+
+
+def get_tracker(name: str) -> LatencyTracker:
+    """Get the shared latency tracker for a provider, creating it on first use."""
+    with _trackers_lock:
+        tracker = _trackers.get(name)
+        if tracker is None:
+            tracker = LatencyTracker(name, **config.LLM_TIMEOUT_CONFIG)
+            _trackers[name] = tracker
+        return tracker
@@ -0,0 +1,142 @@
+"""
+Circuit breaker for LLM provider calls.
+After repeated failures a provider is skipped for a cooldown window, so a
+provider outage costs one timeout per cooldown instead of one per document.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+import config
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when a call is rejected because the provider's circuit is open."""
+
+
+class LocalCallError(RuntimeError):
+    """Base for call failures on our side (not the provider's); the breaker does not count these."""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker with exponential cooldown.
+    
+    Once the cooldown elapses the circuit is half-open: a single probe call
+    is let through and every other caller keeps failing fast until the probe
+    succeeds (closing the circuit) or fails (re-opening it).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 3,
+        cooldown_seconds: float = 30.0,
+        max_cooldown_seconds: float = 600.0
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.max_cooldown_seconds = max_cooldown_seconds
+        self.failures = 0
+        self.trips = 0
+        self.opened_at: Optional[float] = None
+        self.probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def current_cooldown(self) -> float:
+        """Cooldown for the current trip (doubles on each consecutive trip)."""
+        return min(self.cooldown_seconds * 2 ** max(self.trips - 1, 0), self.max_cooldown_seconds)
+
+    def allow(self) -> bool:
+        """Return True if a call may proceed (circuit closed, or cooldown elapsed with no probe in flight)."""
+        with self._lock:
+            return self._can_pass()
+
+    def _can_pass(self) -> bool:
+        """Closed, or half-open with the probe slot free (caller holds the lock)."""
+        if self.opened_at is None:
+            return True
+        return not self.probing and time.monotonic() - self.opened_at >= self.current_cooldown
+
+    def _admit(self):
+        """
+        Admit a call, claiming the probe slot if the circuit is half-open.
+        
+        Raises:
+            CircuitOpenError: If the circuit is open or another probe is in flight
+        """
+        with self._lock:
+            if not self._can_pass():
+                raise CircuitOpenError(f"Circuit open for {self.name} - skipping call")
+            if self.opened_at is not None:
+                self.probing = True
+
+    def _release_probe(self):
+        """Free the probe slot without counting the call as a success or failure."""
+        with self._lock:
+            self.probing = False
+
+    def record_success(self):
+        """Close the circuit after a successful call."""
+        with self._lock:
+            self.failures = 0
+            self.trips = 0
+            self.opened_at = None
+            self.probing = False
+
+    def record_failure(self):
+        """Count a failure, opening (or re-opening) the circuit at the threshold."""
+        with self._lock:
+            self.probing = False
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                self.trips += 1
+                self.opened_at = time.monotonic()
+                logger.warning(
+                    "Circuit opened for %s after %d failures (cooldown: %.0fs)",
+                    self.name, self.failures, self.current_cooldown
+                )
+
+    def call(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Run fn through the breaker.
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+            LocalCallError: Passed through from fn without counting as a failure
+        """
+        self._admit()
+        try:
+            result = fn(*args, **kwargs)
+        except LocalCallError:
+            self._release_probe()
+            raise
+        except Exception:
+            self.record_failure()
+            raise
+        except BaseException:
+            # Interrupted, not a provider failure
+            self._release_probe()
+            raise
+        self.record_success()
+        return result
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """Get the shared circuit breaker for a provider, creating it on first use."""
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(name, **config.CIRCUIT_BREAKER_CONFIG)
+            _breakers[name] = breaker
+        return breaker
@@ -0,0 +1,139 @@
+"""
+LLM Response Cache.
+Exact-match cache of LLM responses keyed by a hash of the fully rendered prompt
+and the model settings, so re-audits of identical invoices skip the LLM
+round-trip entirely. Entries expire after a TTL and the table is capped at a
+maximum row count.
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from functools import cache
+from typing import Any, Optional, Tuple
+
+import config
+
+logger = logging.getLogger(__name__)
+
+# Bump when a cached response format changes (parser, result schema or the
+# way responses are stored), so entries written by older code are never read
+CACHE_SCHEMA_VERSION = 1
+
+# Expired and excess rows are pruned on open and after every this many puts
+_PRUNE_EVERY_PUTS = 100
+
+
+def llm_settings(llm: Any) -> Tuple[Optional[str], Optional[float]]:
+    """
+    Read the model name and temperature off a LangChain chat model.
+
+    Returns:
+        Tuple of (model, temperature); either is None if the client does not expose it
+    """
+    model = getattr(llm, "model_name", None) or getattr(llm, "model", None)
+    return model, getattr(llm, "temperature", None)
+
+
+class LLMResponseCache:
+    """SQLite-backed exact-match cache of LLM responses with TTL and row-count eviction."""
+
+    def __init__(self, db_path: str, ttl_seconds: Optional[float] = None, max_rows: Optional[int] = None):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.max_rows = max_rows
+        self._puts_since_prune = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(llm_responses)")]
+        if columns and "created_at" not in columns:
+            # Table from before TTL support; its keys no longer match anyway
+            self._conn.execute("DROP TABLE llm_responses")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_responses "
+            "(key TEXT PRIMARY KEY, response TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS llm_responses_created_at ON llm_responses (created_at)")
+        self._conn.commit()
+        with self._lock:
+            self._prune()
+
+    @staticmethod
+    def make_key(
+        namespace: str,
+        rendered_prompt: str,
+        model: Optional[str] = None,
+        temperature: Optional[float] = None
+    ) -> str:
+        """
+        Build a cache key for a rendered prompt.
+
+        Args:
+            namespace: Disambiguates callers/providers (e.g. "extraction:groq")
+            rendered_prompt: Full prompt text sent to the LLM
+            model: Model name, so switching models never returns stale answers
+            temperature: Sampling temperature the response was generated with
+
+        Returns:
+            SHA-256 hex digest
+        """
+        header = f"v{CACHE_SCHEMA_VERSION}\n{namespace}\n{model}\n{temperature}"
+        return hashlib.sha256(f"{header}\n{rendered_prompt}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for a key, or None on miss or expiry."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response FROM llm_responses WHERE key = ? AND created_at >= ?",
+                (key, self._expiry_cutoff())
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, key: str, response: str):
+        """Store a response for a key, pruning periodically."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_responses (key, response, created_at) VALUES (?, ?, ?)",
+                (key, response, time.time())
+            )
+            self._conn.commit()
+            self._puts_since_prune += 1
+            if self._puts_since_prune >= _PRUNE_EVERY_PUTS:
+                self._prune()
+
+    def _expiry_cutoff(self) -> float:
+        """Oldest created_at still considered fresh."""
+        return time.time() - self.ttl_seconds if self.ttl_seconds else 0.0
+
+    def _prune(self):
+        """Delete expired rows, then the oldest rows beyond max_rows (caller holds the lock)."""
+        self._puts_since_prune = 0
+        deleted = self._conn.execute(
+            "DELETE FROM llm_responses WHERE created_at < ?", (self._expiry_cutoff(),)
+        ).rowcount
+        if self.max_rows:
+            deleted += self._conn.execute(
+                "DELETE FROM llm_responses WHERE key IN "
+                "(SELECT key FROM llm_responses ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_rows,)
+            ).rowcount
+        self._conn.commit()
+        if deleted:
+            logger.info("Pruned %d LLM cache entries", deleted)
+
+
+@cache
+def get_llm_cache() -> LLMResponseCache:
+    """
+    Shared response cache, opened on first use.
+
+    The SQLite file is only created when a cached LLM call actually runs,
+    not on import (demo mode and ENABLE_LLM_CACHE=false never touch it).
+    """
+    return LLMResponseCache(
+        str(config.LLM_CACHE_PATH),
+        ttl_seconds=config.LLM_CACHE_TTL_DAYS * 86400,
+        max_rows=config.LLM_CACHE_MAX_ROWS
+    )
@@ -3,18 +3,14 @@ Observability and Forensic Logging for GreenTrust AI.
 Handles structured logging of LLM interactions and generates audit trail PDFs.
 """
 
-import json
 import logging
 import os
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, List, Optional
+import orjson
 from langchain_core.callbacks import BaseCallbackHandler
 from langchain_core.outputs import LLMResult
-from reportlab.lib.pagesizes import letter
-from reportlab.lib import colors
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 
 # Ensure logs directory exists
 LOGS_DIR = Path("logs")
@@ -47,12 +43,18 @@ class AuditLogger:
             "metadata": metadata or {}
         }
         
-        with open(self.log_file, "a", encoding="utf-8") as f:
-            f.write(json.dumps(entry) + "\n")
+        with open(self.log_file, "ab") as f:
+            f.write(orjson.dumps(entry) + b"\n")
 
     @staticmethod
     def generate_forensic_log_pdf(document_id: str, reasoning_history: List[Any], logs: List[Dict] = None):
         """Generate a forensic PDF report of the audit trail."""
+        # ReportLab is imported here so LLM logging (via LoggingCallbackHandler)
+        # does not load it in every process
+        from reportlab.lib.pagesizes import letter
+        from reportlab.lib import colors
+        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
         
         filename = f"output/{document_id}_forensic_log.pdf"
         os.makedirs("output", exist_ok=True)
@@ -112,13 +114,15 @@ class AuditLogger:
                 
                 # Prompt
                 story.append(Paragraph("<b>Prompt:</b>", styles['Normal']))
-                p_text = log.get('full_prompt', '')[:500] + "..." if len(log.get('full_prompt', '')) > 500 else log.get('full_prompt', '')
+                prompt = log.get('full_prompt', '')
+                p_text = prompt[:500] + "..." if len(prompt) > 500 else prompt
                 story.append(Paragraph(p_text.replace('\n', '<br/>'), styles['Code']))
                 story.append(Spacer(1, 5))
                 
                 # Response
                 story.append(Paragraph("<b>Response:</b>", styles['Normal']))
-                r_text = log.get('response', '')[:500] + "..." if len(log.get('response', '')) > 500 else log.get('response', '')
+                response = log.get('response', '')
+                r_text = response[:500] + "..." if len(response) > 500 else response
                 story.append(Paragraph(r_text.replace('\n', '<br/>'), styles['Code']))
                 story.append(Spacer(1, 15))
 
@@ -8,50 +8,92 @@ from typing import Tuple, Dict, List
 
 class PIIGuard:
     """Handles redaction of Personally Identifiable Information (PII)."""
-    
+
     def __init__(self):
         # Regex patterns for common PII
+        # Order matters for the combined scan: at a given position the first
+        # listed pattern wins, so more specific formats come before PHONE.
         self.patterns = {
             "EMAIL": r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
-            "PHONE": r'\b(\+\d{1,3}[-.]?)?\(?\d{3}\)?[-.]?\d{3}[-.]?\d{4}\b',
             "CREDIT_CARD": r'\b(?:\d{4}[-\s]){3}\d{4}\b|\b\d{16}\b',
+            "AADHAAR": r'\b\d{4}\s\d{4}\s\d{4}\b',
             "SSN_US": r'\b\d{3}-\d{2}-\d{4}\b',
             # GST is public business info, usually fine, but PAN might be sensitive
             "PAN_INDIA": r'\b[A-Z]{5}[0-9]{4}[A-Z]{1}\b',
-            "AADHAAR": r'\b\d{4}\s\d{4}\s\d{4}\b'
+            "PHONE": r'\b(\+\d{1,3}[-.]?)?\(?\d{3}\)?[-.]?\d{3}[-.]?\d{4}\b'
         }
-    
+
+        # All patterns fused into one alternation so detection and redaction
+        # share a single left-to-right scan of the text
+        self._combined = re.compile(
+            "|".join(f"(?P<{pii_type}>{pattern})" for pii_type, pattern in self.patterns.items())
+        )
+
+    def scan(self, text: str) -> Tuple[List[str], List[Tuple[int, int, str]]]:
+        """
+        Scan text once for all PII types.
+
+        Args:
+            text: Input text
+
+        Returns:
+            Tuple of (pii_types, spans) where spans are (start, end, pii_type)
+            for each non-overlapping match in text order
+        """
+        spans = [(m.start(), m.end(), m.lastgroup) for m in self._combined.finditer(text)]
+        pii_types = list(dict.fromkeys(pii_type for _, _, pii_type in spans))
+        return pii_types, spans
+
+    def redact_spans(self, text: str, spans: List[Tuple[int, int, str]]) -> Tuple[str, Dict[str, str]]:
+        """
+        Replace previously scanned PII spans with numbered placeholders.
+
+        Args:
+            text: Text the spans were computed on
+            spans: Output of scan()
+
+        Returns:
+            Tuple of (redacted_text, mapping_dict)
+        """
+        parts = []
+        mapping = {}
+        replacements = {}
+        counters = {}
+        cursor = 0
+
+        for start, end, pii_type in spans:
+            original = text[start:end]
+            replacement = replacements.get((pii_type, original))
+            if replacement is None:
+                counters[pii_type] = counters.get(pii_type, 0) + 1
+                replacement = f"[{pii_type}_{counters[pii_type]}]"
+                replacements[(pii_type, original)] = replacement
+                mapping[replacement] = original
+            parts.append(text[cursor:start])
+            parts.append(replacement)
+            cursor = end
+
+        parts.append(text[cursor:])
+        return "".join(parts), mapping
+
     def redact_text(self, text: str) -> Tuple[str, Dict[str, str]]:
         """
         Redact PII from text.
-        
+
         Args:
             text: Input text
-            
+
         Returns:
             Tuple of (redacted_text, mapping_dict)
             mapping_dict allows purely reversing if needed locally, although mainly we want to hide it from LLM.
         """
-        redacted_text = text
-        mapping = {}
-        
-        for pii_type, pattern in self.patterns.items():
-            matches = re.finditer(pattern, text)
-            for i, match in enumerate(matches):
-                original = match.group()
-                replacement = f"[{pii_type}_{i+1}]"
-                redacted_text = redacted_text.replace(original, replacement)
-                mapping[replacement] = original
-                
-        return redacted_text, mapping
+        _, spans = self.scan(text)
+        return self.redact_spans(text, spans)
 
     def contains_pii(self, text: str) -> List[str]:
         """Check if text contains potential PII."""
-        found_types = []
-        for pii_type, pattern in self.patterns.items():
-            if re.search(pattern, text):
-                found_types.append(pii_type)
-        return found_types
+        pii_types, _ = self.scan(text)
+        return pii_types
 
 # Singleton instance
 pii_guard = PIIGuard()
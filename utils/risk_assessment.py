@@ -29,6 +29,13 @@ RISK_WEIGHTS = {
     "environmental_risk": 5
 }
 
+# Flattened (needle, weight, factor label) entries, lowercased and formatted once
+HIGH_RISK_MATCHERS = [
+    (high_risk_region.lower(), RISK_WEIGHTS[category], f"{category.replace('_', ' ').title()}: {high_risk_region}")
+    for category, regions in HIGH_RISK_REGIONS.items()
+    for high_risk_region in regions
+]
+
 
 def assess_region_risk(region: str) -> Tuple[int, List[str], bool]:
     """
@@ -44,11 +51,10 @@ def assess_region_risk(region: str) -> Tuple[int, List[str], bool]:
     risk_score = 0
     risk_factors = []
     
-    for category, regions in HIGH_RISK_REGIONS.items():
-        for high_risk_region in regions:
-            if high_risk_region.lower() in region_lower:
-                risk_score += RISK_WEIGHTS[category]
-                risk_factors.append(f"{category.replace('_', ' ').title()}: {high_risk_region}")
+    for needle, weight, factor in HIGH_RISK_MATCHERS:
+        if needle in region_lower:
+            risk_score += weight
+            risk_factors.append(factor)
     
     # Determine if human review is required (risk score >= 7)
     requires_review = risk_score >= 7